@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0005_rename_updated_at_customuser_uploaded_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='file_variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Profile Picture Variants'),
+        ),
+    ]
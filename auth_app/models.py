@@ -25,6 +25,11 @@ class CustomUser(AbstractUser):
         default=None,
         verbose_name='Profile Picture'
     )
+    file_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Profile Picture Variants'
+    )
     location = models.CharField(
         max_length=100,
         blank=True,
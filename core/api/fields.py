@@ -0,0 +1,34 @@
+# Third-party suppliers
+from rest_framework import serializers
+
+# Local imports
+from core.images import get_variant_urls, get_variants_field_name
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    Read-only field for the urls of the rendered variants of an image,
+    read from the variants stored next to the image field.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        kwargs['read_only'] = True
+        kwargs['source'] = '*'
+        self.image_field = image_field
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        """
+        Get the variant urls, absolute if a request is given.
+        """
+        urls = get_variant_urls(
+            getattr(instance, self.image_field),
+            getattr(instance, get_variants_field_name(self.image_field))
+        )
+        request = self.context.get('request')
+        if not urls or request is None:
+            return urls
+        return {
+            variant: url and request.build_absolute_uri(url)
+            for variant, url in urls.items()
+        }
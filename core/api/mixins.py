@@ -0,0 +1,201 @@
+# Third-party suppliers
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.settings import api_settings
+
+# Local imports
+from core.api.renderers import CSVRenderer, NDJSONRenderer
+
+
+class ConditionalGetMixin:
+    """
+    Mixin answering conditional GETs by validators, so an unchanged
+    resource gets HTTP 304 before any serializer work.
+    """
+    etag = None
+    last_modified = None
+
+    def get_not_modified_response(
+        self, request, etag=None, last_modified=None
+    ):
+        """
+        Get an HTTP 304 response if the client copy is still valid.
+        """
+        self.etag = quote_etag(etag) if etag else None
+        self.last_modified = (
+            int(last_modified.timestamp()) if last_modified else None
+        )
+        return get_conditional_response(
+            request, etag=self.etag, last_modified=self.last_modified)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """
+        Finalize a response including the validators of the resource.
+        """
+        response = super().finalize_response(
+            request, response, *args, **kwargs)
+        if response.status_code in (200, 304):
+            if self.etag:
+                response.headers.setdefault('ETag', self.etag)
+            if self.last_modified:
+                response.headers.setdefault(
+                    'Last-Modified', http_date(self.last_modified))
+        return response
+
+
+class SparseFieldsMixin:
+    """
+    Mixin for list views supporting '?fields=' and '?omit=', which prune
+    serializer fields and the columns selected from the database.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+    # Model fields read by serializer fields without a plain source.
+    sparse_field_sources = {}
+
+    def get_query_param_list(self, param):
+        """
+        Get the comma separated values of a query parameter.
+        """
+        value = self.request.query_params.get(param, '')
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    def is_sparse(self):
+        """
+        Check the request for asking for a sparse fieldset.
+        """
+        params = self.request.query_params
+        return self.request.method == 'GET' and bool(
+            params.get(self.fields_query_param)
+            or params.get(self.omit_query_param)
+        )
+
+    def is_field_requested(self, name):
+        """
+        Check a serializer field to be part of the response.
+        """
+        if not self.is_sparse():
+            return True
+        fields = self.get_query_param_list(self.fields_query_param)
+        omitted = self.get_query_param_list(self.omit_query_param)
+        return (not fields or name in fields) and name not in omitted
+
+    def get_serializer(self, *args, **kwargs):
+        """
+        Get a serializer without the fields left out by the request.
+        """
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.is_sparse():
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if not self.is_field_requested(name):
+                    target.fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        """
+        Filter a queryset, selecting only the columns that are needed.
+        """
+        queryset = super().filter_queryset(queryset)
+        if self.is_sparse():
+            queryset = self.narrow_queryset(queryset)
+        return queryset
+
+    def narrow_queryset(self, queryset):
+        """
+        Restrict a queryset to the model fields read by the kept fields.
+        """
+        model_fields = {f.name for f in queryset.model._meta.concrete_fields}
+        columns = {'pk'}
+        for name, field in self.get_serializer_class()().fields.items():
+            if not self.is_field_requested(name):
+                continue
+            if name in self.sparse_field_sources:
+                columns.update(self.sparse_field_sources[name])
+            elif field.source in model_fields:
+                columns.add(field.source)
+            else:
+                return queryset
+        for order in queryset.query.order_by:
+            if isinstance(order, str) and order.lstrip('-') in model_fields:
+                columns.add(order.lstrip('-'))
+        return queryset.only(*columns)
+
+
+class ExpandMixin:
+    """
+    Mixin for views supporting '?expand=', which embeds related objects
+    instead of their ids or links, so clients need no follow-up requests.
+    """
+    expand_query_param = 'expand'
+    expandable_fields = []
+
+    def get_expand(self):
+        """
+        Get the names of the requested expandable fields.
+        """
+        value = self.request.query_params.get(self.expand_query_param, '')
+        names = {name.strip() for name in value.split(',')}
+        return names & set(self.expandable_fields)
+
+    def is_expanded(self, name):
+        """
+        Check a field to be expanded.
+        """
+        return name in self.get_expand()
+
+    def get_serializer_context(self):
+        """
+        Get serializer context including the expanded fields.
+        """
+        context = super().get_serializer_context()
+        return {**context, 'expand': self.get_expand()}
+
+
+class StreamingExportMixin:
+    """
+    Mixin for list views streaming all rows, requested as NDJSON or CSV
+    by '?format=ndjson|csv' or by the Accept header.
+    """
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [
+        NDJSONRenderer, CSVRenderer
+    ]
+    export_chunk_size = 2000
+    export_filename = 'export'
+
+    def is_export(self):
+        """
+        Check the request for asking for a streaming export.
+        """
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        return getattr(renderer, 'streaming', False)
+
+    def get_export_objects(self, queryset):
+        """
+        Get the objects to export, fetched from the database in chunks.
+        """
+        return queryset.iterator(chunk_size=self.export_chunk_size)
+
+    def get_export_response(self, queryset):
+        """
+        Get a response streaming the serialized rows of a queryset,
+        fetched from the database in chunks.
+        """
+        renderer = self.request.accepted_renderer
+        serializer = self.get_serializer()
+        rows = (
+            serializer.to_representation(obj)
+            for obj in self.get_export_objects(queryset)
+        )
+        response = StreamingHttpResponse(
+            renderer.render_rows(rows, [
+                name for name, field in serializer.fields.items()
+                if not field.write_only
+            ]),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{self.export_filename}.{renderer.format}"'
+        )
+        return response
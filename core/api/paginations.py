@@ -0,0 +1,158 @@
+# Standard libraries
+import json
+from base64 import b64decode, b64encode
+
+# Third-party suppliers
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Paginates by the value of the ordering field and the id of the
+    last row, so every page costs the same and no count is needed.
+    """
+    mode_query_param = 'paginate'
+    mode = 'cursor'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    @classmethod
+    def is_requested(cls, request):
+        """
+        Check the request for asking for keyset pagination.
+        """
+        params = request.query_params
+        return (
+            cls.cursor_query_param in params
+            or params.get(cls.mode_query_param) == cls.mode
+        )
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Get the ordering field, as the id is always used as tiebreaker.
+        """
+        return super().get_ordering(request, queryset, view)[:1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Get the page of rows following or preceding the cursor.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.field = queryset.model._meta.get_field(
+            self.ordering[0].lstrip('-'))
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor['r'])
+
+        rows = self.get_rows(queryset, reverse)
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_rows(self, queryset, reverse):
+        """
+        Get the rows of the page and one more, telling if there are more.
+        """
+        queryset = queryset.order_by(*self.get_order_by(reverse))
+        if self.cursor:
+            queryset = queryset.filter(self.get_position_filter(reverse))
+        return list(queryset[:self.page_size + 1])
+
+    def get_order_by(self, reverse):
+        """
+        Get the order_by() arguments for the ordering field and the id.
+        """
+        descending = self.ordering[0].startswith('-') != reverse
+        nulls = {}
+        if self.field.null:
+            nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+        expression = F(self.field.name)
+        expression = (
+            expression.desc(**nulls) if descending
+            else expression.asc(**nulls)
+        )
+        return [expression, '-pk' if descending else 'pk']
+
+    def get_position_filter(self, reverse):
+        """
+        Get the filter for rows after (or before) the cursor position.
+
+        Empty values of nullable fields are always sorted last.
+        """
+        value, pk = self.cursor['v'], self.cursor['i']
+        name = self.field.name
+        descending = self.ordering[0].startswith('-') != reverse
+        lookup = 'lt' if descending else 'gt'
+        tiebreak = Q(**{name: value, f'pk__{lookup}': pk})
+
+        if value is None:
+            in_nulls = Q(**{f'{name}__isnull': True, f'pk__{lookup}': pk})
+            if reverse:
+                return Q(**{f'{name}__isnull': False}) | in_nulls
+            return in_nulls
+        position = Q(**{f'{name}__{lookup}': value}) | tiebreak
+        if self.field.null and not reverse:
+            position |= Q(**{f'{name}__isnull': True})
+        return position
+
+    def decode_cursor(self, request):
+        """
+        Get the cursor position from the request.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')))
+            if cursor['o'] != self.ordering[0]:
+                raise ValueError
+            cursor['v'] = self.field.to_python(cursor['v'])
+            cursor['i'] = int(cursor['i'])
+            cursor['r'] = bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, instance, reverse):
+        """
+        Get an url with the cursor positioned at the given row.
+        """
+        value = getattr(instance, self.field.attname)
+        cursor = {
+            'o': self.ordering[0],
+            'v': None if value is None else self.field.value_to_string(
+                instance),
+            'i': instance.pk,
+            'r': int(reverse),
+        }
+        encoded = b64encode(json.dumps(cursor).encode('ascii')).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        """
+        Get the link to the following page.
+        """
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        """
+        Get the link to the preceding page.
+        """
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
@@ -0,0 +1,36 @@
+# Third-party suppliers
+from rest_framework import serializers
+
+
+def get_query_value(request, name, field, default=None):
+    """
+    Get a query parameter validated by a serializer field.
+    """
+    value = request.query_params.get(name, default)
+    if value is None:
+        return None
+    try:
+        return field.run_validation(value)
+    except serializers.ValidationError as error:
+        raise serializers.ValidationError({name: error.detail})
+
+
+def get_id_list(request, name, max_ids):
+    """
+    Get the comma-separated ids of a query parameter in order and
+    without duplicates.
+    """
+    value = request.query_params.get(name, '')
+    try:
+        ids = list(dict.fromkeys(
+            int(pk) for pk in value.split(',') if pk.strip()
+        ))
+    except ValueError:
+        raise serializers.ValidationError({
+            name: 'Comma-separated ids are required.'
+        })
+    if not ids or len(ids) > max_ids or min(ids) < 1:
+        raise serializers.ValidationError({
+            name: f'Between 1 and {max_ids} positive ids are required.'
+        })
+    return ids
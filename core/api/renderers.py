@@ -0,0 +1,87 @@
+# Standard libraries
+import csv
+import json
+
+# Third-party suppliers
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class StreamingRenderer(BaseRenderer):
+    """
+    Base renderer writing rows one by one, so exports can be streamed.
+    """
+    charset = 'utf-8'
+    streaming = True
+
+    def render_rows(self, rows, field_names):
+        """
+        Get an iterator of encoded chunks, one per row.
+        """
+        raise NotImplementedError
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render response data as a whole.
+        """
+        rows = data if isinstance(data, list) else [data]
+        field_names = list(rows[0]) if rows and isinstance(
+            rows[0], dict) else []
+        return b''.join(self.render_rows(rows, field_names))
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """
+    Renderer for newline delimited JSON, one object per line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render_rows(self, rows, field_names):
+        """
+        Get one JSON line per row.
+        """
+        for row in rows:
+            line = json.dumps(row, cls=JSONEncoder, ensure_ascii=False)
+            yield (line + '\n').encode(self.charset)
+
+
+class EchoBuffer:
+    """
+    File-like object returning what is written, for csv.writer.
+    """
+
+    def write(self, value):
+        """
+        Get the written value.
+        """
+        return value
+
+
+class CSVRenderer(StreamingRenderer):
+    """
+    Renderer for CSV with a header line. Nested values are JSON encoded.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def get_cell(self, value):
+        """
+        Get a CSV cell of a value.
+        """
+        if value is None:
+            return ''
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, cls=JSONEncoder, ensure_ascii=False)
+        return value
+
+    def render_rows(self, rows, field_names):
+        """
+        Get the header line followed by one line per row.
+        """
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(field_names).encode(self.charset)
+        for row in rows:
+            line = writer.writerow(
+                [self.get_cell(row.get(name)) for name in field_names])
+            yield line.encode(self.charset)
@@ -0,0 +1,186 @@
+# Standard libraries
+import hashlib
+import logging
+import os
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
+
+# Third-party suppliers
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+# Sent with the model as sender and the pk of the row once the variants
+# of one of its images are stored.
+variants_rendered = Signal()
+
+
+def get_variant_name(name, variant, content):
+    """
+    Get the storage name of an image variant, including a hash of its
+    content, so a rendered variant is never overwritten and can be
+    served as immutable.
+    """
+    root = posixpath.splitext(name)[0]
+    directory, filename = posixpath.split(root)
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return posixpath.join(
+        directory, 'variants', f'{filename}.{variant}.{digest}.webp')
+
+
+def render_variants(media_root, name, variants):
+    """
+    Render all variants of an image below the media root and get
+    their storage names by variant.
+
+    Runs in a worker process, so it gets everything by arguments.
+    """
+    rendered = {}
+    with Image.open(os.path.join(media_root, name)) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        for variant, options in variants.items():
+            size = tuple(options['size'])
+            if options.get('crop'):
+                output = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+            else:
+                output = image.copy()
+                output.thumbnail(size, Image.Resampling.LANCZOS)
+            buffer = BytesIO()
+            output.save(buffer, 'WEBP', quality=options.get('quality', 80))
+            content = buffer.getvalue()
+            variant_name = get_variant_name(name, variant, content)
+            target = os.path.join(media_root, variant_name)
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target + '.tmp', 'wb') as file:
+                    file.write(content)
+                os.replace(target + '.tmp', target)
+            rendered[variant] = variant_name
+    return rendered
+
+
+def get_executor():
+    """
+    Get the process pool rendering image variants.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_VARIANT_WORKERS)
+    return _executor
+
+
+def get_variants_field_name(field_name):
+    """
+    Get the name of the model field storing the variants of an image
+    field.
+    """
+    return f'{field_name}_variants'
+
+
+def save_variants(model_label, pk, field_name, name, variants):
+    """
+    Store the rendered variants of an image, unless the image was
+    replaced meanwhile, touching the modification time of the row.
+    """
+    model = apps.get_model(model_label)
+    variants_field = get_variants_field_name(field_name)
+    rows = model.objects.filter(pk=pk, **{field_name: name})
+    previous = rows.values_list(variants_field, flat=True).first() or {}
+    changes = {variants_field: variants}
+    for field in model._meta.concrete_fields:
+        if getattr(field, 'auto_now', False):
+            changes[field.name] = timezone.now()
+    updated = rows.update(**changes)
+    if updated:
+        variants_rendered.send(sender=model, pk=pk)
+        for old_name in set(previous.values()) - set(variants.values()):
+            default_storage.delete(old_name)
+    return updated
+
+
+def save_rendered_variants(target, future):
+    """
+    Store the variants rendered on the process pool, or log the failure.
+
+    Runs in a thread of the pool, so it closes its database connection.
+    """
+    if future.exception():
+        logger.error('Rendering image variants failed: %s', future.exception())
+        return
+    try:
+        save_variants(*target, future.result())
+    except Exception:
+        logger.exception('Storing image variants failed.')
+    finally:
+        close_old_connections()
+
+
+def submit_variants(target):
+    """
+    Render the variants of an image on the process pool, or inline
+    if no workers are configured, and store them.
+
+    The target is (model_label, pk, field_name, name) of the image.
+    """
+    args = (str(settings.MEDIA_ROOT), target[3], settings.IMAGE_VARIANTS)
+    if not settings.IMAGE_VARIANT_WORKERS:
+        return save_variants(*target, render_variants(*args))
+    future = get_executor().submit(render_variants, *args)
+    future.add_done_callback(partial(save_rendered_variants, target))
+    return future
+
+
+def get_target(field_file):
+    """
+    Get (model_label, pk, field_name, name) of a stored image.
+    """
+    instance = field_file.instance
+    return (
+        instance._meta.label, instance.pk, field_file.field.name,
+        field_file.name
+    )
+
+
+def schedule_variants(field_file):
+    """
+    Forget the variants of a replaced image and render the new ones
+    once the transaction commits.
+    """
+    instance = field_file.instance
+    variants_field = get_variants_field_name(field_file.field.name)
+    if getattr(instance, variants_field):
+        setattr(instance, variants_field, {})
+        type(instance).objects.filter(pk=instance.pk).update(
+            **{variants_field: {}})
+    if field_file:
+        target = get_target(field_file)
+        transaction.on_commit(lambda: submit_variants(target))
+
+
+def get_variant_urls(field_file, variants):
+    """
+    Get the urls of the variants of an image by their stored names,
+    None for variants not rendered yet.
+    """
+    if not field_file:
+        return None
+    return {
+        variant: (
+            default_storage.url(variants[variant]) if variant in variants
+            else None
+        )
+        for variant in settings.IMAGE_VARIANTS
+    }
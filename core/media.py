@@ -0,0 +1,189 @@
+# Standard libraries
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+# Third-party suppliers
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """
+    File limited to a byte range.
+
+    It keeps fileno() and tell(), so WSGI servers using os.sendfile()
+    for wsgi.file_wrapper send the range without copying it.
+    """
+
+    def __init__(self, file, start, length):
+        """
+        Position the file at the start of the range.
+        """
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        """
+        Read up to size bytes, but not beyond the range.
+        """
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        """
+        Get the file descriptor of the file.
+        """
+        return self.file.fileno()
+
+    def tell(self):
+        """
+        Get the current position in the file.
+        """
+        return self.file.tell()
+
+    def close(self):
+        """
+        Close the file.
+        """
+        self.file.close()
+
+
+def get_media_path(path):
+    """
+    Get the absolute path of a media file, or raise Http404.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Media file not found.')
+    if not os.path.isfile(full_path):
+        raise Http404('Media file not found.')
+    return full_path
+
+
+def get_etag(stat):
+    """
+    Get an ETag from the size and modification time of a file.
+    """
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def get_range(request, size, etag):
+    """
+    Get (start, length) of a single requested byte range.
+
+    Returns None for the whole file, which is served for missing,
+    multiple or outdated ('If-Range') ranges, and raises ValueError
+    for an unsatisfiable range.
+    """
+    header = request.META.get('HTTP_RANGE', '')
+    match = RANGE_RE.match(header.strip())
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not match or (if_range and if_range != etag):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        raise ValueError(header)
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end - start + 1
+
+
+def get_offload_response(path, full_path):
+    """
+    Get an empty response handing the file off to the front proxy,
+    or None if media files are served directly.
+    """
+    mode = settings.MEDIA_SERVE_MODE
+    if mode == 'x-accel':
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_PREFIX + quote(path))
+    elif mode == 'x-sendfile':
+        response = HttpResponse()
+        response['X-Sendfile'] = full_path
+    else:
+        return None
+    # Let the proxy set the type from the file it sends.
+    del response['Content-Type']
+    return response
+
+
+def get_file_response(request, full_path, stat, etag):
+    """
+    Get a response streaming the file or the requested range of it.
+    """
+    content_type = (
+        mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    )
+    try:
+        byte_range = get_range(request, stat.st_size, etag)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+
+    file = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, length = byte_range
+        response = FileResponse(
+            FileRange(file, start, length),
+            content_type=content_type, status=206
+        )
+        response['Content-Length'] = length
+        response['Content-Range'] = (
+            f'bytes {start}-{start + length - 1}/{stat.st_size}')
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serve a media file, handed off to the front proxy or streamed
+    directly with support for conditional and range requests.
+
+    Stored file names are never overwritten: uploads get a free name
+    and image variants carry a hash of their content. So files can be
+    cached for long by clients and proxies.
+    """
+    full_path = get_media_path(path)
+    stat = os.stat(full_path)
+    etag = get_etag(stat)
+    last_modified = int(stat.st_mtime)
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = get_offload_response(path, full_path)
+    if response is None:
+        response = get_file_response(request, full_path, stat, etag)
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    if response.status_code != 416:
+        patch_cache_control(
+            response, public=True, immutable=True,
+            max_age=settings.MEDIA_CACHE_MAX_AGE
+        )
+    return response
@@ -19,6 +19,30 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
+# Media files are served by core.media.serve_media, either directly
+# ('direct') or handed off to the front proxy ('x-accel' for nginx,
+# 'x-sendfile' for Apache). MEDIA_ACCEL_PREFIX is the internal nginx
+# location aliasing MEDIA_ROOT.
+MEDIA_SERVE_MODE = 'direct'
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+MEDIA_CACHE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Web-optimized variants rendered for uploaded images, see core.images.
+# Set IMAGE_VARIANT_WORKERS to 0 to render in the calling process.
+IMAGE_VARIANTS = {
+    'thumbnail': {'size': (320, 240), 'crop': True, 'quality': 80},
+    'web': {'size': (1280, 1280), 'crop': False, 'quality': 85},
+}
+IMAGE_VARIANT_WORKERS = 2
+
+# Resumable uploads, see upload_app. Chunks are streamed to temporary
+# files in UPLOAD_TEMP_DIR, reading UPLOAD_BUFFER_SIZE bytes at a time.
+UPLOAD_TEMP_DIR = os.path.join(BASE_DIR, 'uploads')
+UPLOAD_MAX_SIZE = 20 * 1024 * 1024
+UPLOAD_BUFFER_SIZE = 64 * 1024
+UPLOAD_IMAGE_FORMATS = ['JPEG', 'PNG', 'GIF', 'WEBP']
+UPLOAD_EXPIRY_HOURS = 24
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -51,6 +75,8 @@ INSTALLED_APPS = [
     'order_app',
     'review_app',
     'base_info_app',
+    'upload_app',
+    'outbox_app',
 ]
 
 AUTH_USER_MODEL = "auth_app.CustomUser"
@@ -126,6 +152,38 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Use a shared backend (e.g. Redis) when running several processes.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+OFFER_LIST_CACHE_TIMEOUT = 300
+
+# Hours an order response is replayed for a retried Idempotency-Key.
+IDEMPOTENCY_KEY_TTL_HOURS = 24
+
+# Days after their last change until finished orders are archived.
+ORDER_ARCHIVE_AFTER_DAYS = 365
+
+# Handlers the outbox dispatcher delivers order and review events to,
+# each a dict with a 'type' and its options, e.g.
+# {'type': 'callable', 'path': 'app.module.func'},
+# {'type': 'file', 'path': '/var/log/coderr/events.jsonl'} or
+# {'type': 'socket', 'path': '/run/coderr/events.sock', 'timeout': 5.0}.
+OUTBOX_HANDLERS = []
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_POLL_INTERVAL = 1.0
+# Seconds a claimed batch stays leased to its worker before another
+# worker may deliver it again, longer than the slowest delivery.
+OUTBOX_LEASE_SECONDS = 300
+OUTBOX_RETENTION_DAYS = 7
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
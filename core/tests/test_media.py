@@ -0,0 +1,116 @@
+# Standard libraries
+import os
+import shutil
+import tempfile
+
+# Third-party suppliers
+from django.test import SimpleTestCase, override_settings
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, MEDIA_SERVE_MODE='direct')
+class MediaServeTests(SimpleTestCase):
+    """
+    Tests for serving media files.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Set up a media file with known content.
+        """
+        super().setUpClass()
+        os.makedirs(os.path.join(MEDIA_ROOT, 'offers'), exist_ok=True)
+        cls.content = bytes(range(256)) * 4
+        with open(os.path.join(MEDIA_ROOT, 'offers', 'logo.png'), 'wb') as f:
+            f.write(cls.content)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Remove the temporary media files.
+        """
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_serve_file(self):
+        """
+        Ensure a file is streamed with validators and caching headers.
+        """
+        res = self.client.get('/media/offers/logo.png')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(b''.join(res.streaming_content), self.content)
+        self.assertEqual(res['Content-Type'], 'image/png')
+        self.assertEqual(res['Content-Length'], str(len(self.content)))
+        self.assertEqual(res['Accept-Ranges'], 'bytes')
+        self.assertIn('immutable', res['Cache-Control'])
+        self.assertIn('ETag', res)
+        self.assertIn('Last-Modified', res)
+
+    def test_serve_range(self):
+        """
+        Ensure byte ranges are served with HTTP 206.
+        """
+        res = self.client.get(
+            '/media/offers/logo.png', HTTP_RANGE='bytes=10-19')
+        self.assertEqual(res.status_code, 206)
+        self.assertEqual(b''.join(res.streaming_content), self.content[10:20])
+        self.assertEqual(res['Content-Length'], '10')
+        self.assertEqual(res['Content-Range'], 'bytes 10-19/1024')
+
+        res = self.client.get(
+            '/media/offers/logo.png', HTTP_RANGE='bytes=-4')
+        self.assertEqual(b''.join(res.streaming_content), self.content[-4:])
+
+    def test_serve_outdated_or_unsatisfiable_range(self):
+        """
+        Ensure an outdated If-Range gets the whole file and an
+        unsatisfiable range HTTP 416.
+        """
+        res = self.client.get(
+            '/media/offers/logo.png',
+            HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"outdated"'
+        )
+        self.assertEqual(res.status_code, 200)
+        res = self.client.get(
+            '/media/offers/logo.png', HTTP_RANGE='bytes=2000-')
+        self.assertEqual(res.status_code, 416)
+        self.assertEqual(res['Content-Range'], 'bytes */1024')
+
+    def test_serve_not_modified(self):
+        """
+        Ensure a matching ETag gets HTTP 304.
+        """
+        etag = self.client.get('/media/offers/logo.png')['ETag']
+        res = self.client.get(
+            '/media/offers/logo.png', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+    def test_serve_missing_or_outside_file(self):
+        """
+        Ensure missing files and paths outside MEDIA_ROOT get HTTP 404.
+        """
+        for path in ['offers/missing.png', '../secret.txt', 'offers']:
+            res = self.client.get(f'/media/{path}')
+            self.assertEqual(res.status_code, 404)
+
+    @override_settings(MEDIA_SERVE_MODE='x-accel')
+    def test_serve_by_x_accel_redirect(self):
+        """
+        Ensure the file is handed off to nginx without a body.
+        """
+        res = self.client.get('/media/offers/logo.png')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            res['X-Accel-Redirect'], '/protected-media/offers/logo.png')
+        self.assertEqual(res.content, b'')
+
+    @override_settings(MEDIA_SERVE_MODE='x-sendfile')
+    def test_serve_by_x_sendfile(self):
+        """
+        Ensure the file is handed off by its absolute path.
+        """
+        res = self.client.get('/media/offers/logo.png')
+        self.assertEqual(
+            res['X-Sendfile'], os.path.join(MEDIA_ROOT, 'offers', 'logo.png'))
@@ -14,16 +14,22 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+# Standard libraries
+import re
+
 # Third-party suppliers
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 
 # Local imports
-from offer_app.api.views import OfferDetailRetrieveAPIView
+from core.media import serve_media
+from offer_app.api.views import (
+    OfferDetailListAPIView, OfferDetailRetrieveAPIView
+)
 from order_app.api.views import (
-    CompletedOrderCountAPIView, OpenOrderCountAPIView
+    BatchOrderCountAPIView, CompletedOrderCountAPIView,
+    OpenOrderCountAPIView, OrderCountsAPIView, OrderRollupAPIView
 )
 
 
@@ -34,6 +40,11 @@ urlpatterns = [
     path('api/profile/', include('profile_app.api.urls')),
     path('api/profiles/', include('profile_app.api.urls')),
     path('api/offers/', include('offer_app.api.urls')),
+    path(
+        'api/offerdetails/',
+        OfferDetailListAPIView.as_view(),
+        name='offerdetail-list'
+    ),
     path('api/offerdetails/<int:pk>/', OfferDetailRetrieveAPIView.as_view()),
     path('api/orders/', include('order_app.api.urls')),
     path(
@@ -46,8 +57,30 @@ urlpatterns = [
         CompletedOrderCountAPIView.as_view(),
         name='completed-order-count'
     ),
+    path(
+        'api/order-counts/',
+        BatchOrderCountAPIView.as_view(),
+        name='order-counts-batch'
+    ),
+    path(
+        'api/order-counts/<int:business_user_id>/',
+        OrderCountsAPIView.as_view(),
+        name='order-counts'
+    ),
+    path(
+        'api/order-rollups/<int:business_user_id>/',
+        OrderRollupAPIView.as_view(),
+        name='order-rollups'
+    ),
     path('api/reviews/', include('review_app.api.urls')),
     path('api/base-info/', include('base_info_app.api.urls')),
+    path('api/uploads/', include('upload_app.api.urls')),
 ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+urlpatterns += [
+    re_path(
+        r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')),
+        serve_media,
+        name='media'
+    ),
+]
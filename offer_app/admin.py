@@ -2,8 +2,10 @@
 from django.contrib import admin
 
 # Local imports
-from .models import Offer, OfferDetail
+from .models import Offer, OfferDetail, OfferFeature, OfferTombstone
 
 
 admin.site.register(Offer)
 admin.site.register(OfferDetail)
+admin.site.register(OfferFeature)
+admin.site.register(OfferTombstone)
@@ -1,19 +1,93 @@
 # Third-party suppliers
+from django.db.models import Count
+from django.db.models.expressions import RawSQL
 from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter, SearchFilter
 
 # Local imports
-from offer_app.models import Offer
+from offer_app.models import Offer, OfferFeature
+from offer_app.search import (
+    MATCH_SQL, RANK_SQL, get_match_query, is_search_index_supported
+)
 
 
 class OfferFilter(filters.FilterSet):
     """
-    Filter offers by creator_id, min_price or max_delivery_time.
+    Filter offers by creator_id, min_price, max_delivery_time or
+    features of their details.
     """
     creator_id = filters.NumberFilter(field_name='user', lookup_expr='exact')
     min_price = filters.NumberFilter(field_name='min_price', lookup_expr='gte')
     max_delivery_time = filters.NumberFilter(
         field_name='max_delivery_time', lookup_expr='lte')
+    feature = filters.CharFilter(method='filter_all_features')
+    feature_any = filters.CharFilter(method='filter_any_feature')
 
     class Meta:
         model = Offer
-        fields = ['creator_id', 'min_price', 'max_delivery_time']
+        fields = [
+            'creator_id', 'min_price', 'max_delivery_time',
+            'feature', 'feature_any'
+        ]
+
+    @staticmethod
+    def get_feature_names(value):
+        """
+        Get the normalized feature names of a comma-separated value.
+        """
+        names = {OfferFeature.normalize(name) for name in value.split(',')}
+        names.discard('')
+        return names
+
+    def filter_all_features(self, queryset, name, value):
+        """
+        Filter offers having all of the given features.
+        """
+        names = self.get_feature_names(value)
+        if not names:
+            return queryset
+        offer_ids = (
+            OfferFeature.objects.filter(name__in=names)
+            .values('offer')
+            .annotate(matches=Count('name', distinct=True))
+            .filter(matches=len(names))
+            .values('offer')
+        )
+        return queryset.filter(pk__in=offer_ids)
+
+    def filter_any_feature(self, queryset, name, value):
+        """
+        Filter offers having any of the given features.
+        """
+        names = self.get_feature_names(value)
+        if not names:
+            return queryset
+        return queryset.filter(pk__in=OfferFeature.objects.filter(
+            name__in=names).values('offer'))
+
+
+class OfferSearchFilter(SearchFilter):
+    """
+    Search offers by title and description via the full-text index,
+    ranked by relevance unless an ordering is requested.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        """
+        Filter offers matching all search terms as prefixes.
+        """
+        if not is_search_index_supported():
+            return super().filter_queryset(request, queryset, view)
+
+        query = get_match_query(self.get_search_terms(request))
+        if not query:
+            return queryset
+        queryset = queryset.filter(pk__in=RawSQL(MATCH_SQL, [query]))
+        if (
+            not getattr(view, 'search_ranking', True)
+            or OrderingFilter.ordering_param in request.query_params
+        ):
+            return queryset
+        return queryset.annotate(
+            search_rank=RawSQL(RANK_SQL, [query])
+        ).order_by('search_rank', '-updated_at')
@@ -1,6 +1,9 @@
 # Third-party suppliers
 from rest_framework.pagination import PageNumberPagination
 
+# Local imports
+from core.api.paginations import KeysetPagination
+
 
 class OfferPagination(PageNumberPagination):
     """
@@ -9,3 +12,13 @@ class OfferPagination(PageNumberPagination):
     page_size = 6
     page_size_query_param = 'page_size'
     max_page_size = 20
+
+
+class OfferCursorPagination(KeysetPagination):
+    """
+    Controls keyset pages of offers, requested by '?paginate=cursor'.
+    """
+    ordering = '-updated_at'
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 20
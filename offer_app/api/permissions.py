@@ -30,4 +30,4 @@ class IsOwnerOrReadOnly(BasePermission):
         """
         if request.method in SAFE_METHODS:
             return True
-        return obj.user == request.user
+        return obj.user_id == request.user.id
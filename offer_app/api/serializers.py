@@ -1,8 +1,15 @@
 # Third-party suppliers
+from django.db import transaction
 from rest_framework import serializers
 
 # Local imports
-from offer_app.models import Offer, OfferDetail
+from core.api.fields import ImageVariantsField
+from core.images import schedule_variants
+from offer_app.api.services import OfferListCache
+from offer_app.models import Offer, OfferDetail, OfferFeature
+from profile_app.api.serializers import (
+    BusinessProfileListSerializer, PublicProfileSerializer
+)
 
 
 class OfferDetailNestedSerializer(serializers.ModelSerializer):
@@ -21,33 +28,47 @@ class OfferDetailNestedSerializer(serializers.ModelSerializer):
 
 class OfferStatsMixin:
     """
-    Mixin providing methods to get offer details.
+    Mixin providing methods to get offer details and to expand the
+    details and the creator profile requested by '?expand='.
     """
 
-    def get_details(self, obj):
+    def is_expanded(self, name):
         """
-        Get offer details.
+        Check a field to be expanded.
         """
-        if self.context.get('detailed'):
-            return OfferDetailNestedSerializer(obj.details.all(), many=True).data
-        return [
-            {'id': d.id, 'url': f'/api/offerdetails/{d.id}/'}
-            for d in obj.details.all()
-        ]
+        return name in self.context.get('expand', ())
 
-    def get_min_price(self, obj):
+    def get_profile_serializer_class(self):
         """
-        Get offer minimum price.
+        Get the serializer of the creator profile, limited to its public
+        part for anonymous users, as profiles require authentication.
         """
-        qs = obj.details.order_by('price')
-        return qs.first().price if qs.exists() else None
+        request = self.context.get('request')
+        if request is not None and request.user.is_authenticated:
+            return BusinessProfileListSerializer
+        return PublicProfileSerializer
 
-    def get_min_delivery_time(self, obj):
+    def to_representation(self, instance):
+        """
+        Get an offer including the creator profile if expanded.
+        """
+        data = super().to_representation(instance)
+        if 'user' in data and self.is_expanded('user'):
+            data['user'] = self.get_profile_serializer_class()(
+                instance.user, context=self.context).data
+        return data
+
+    def get_details(self, obj):
         """
-        Get offer minimum delivery time.
+        Get offer details.
         """
-        qs = obj.details.order_by('delivery_time_in_days')
-        return qs.first().delivery_time_in_days if qs.exists() else None
+        if self.context.get('detailed') or self.is_expanded('details'):
+            return OfferDetailNestedSerializer(
+                obj.details.all(), many=True).data
+        return [
+            {'id': d.id, 'url': f'/api/offerdetails/{d.id}/'}
+            for d in obj.details.all()
+        ]
 
 
 class OfferListSerializer(OfferStatsMixin, serializers.ModelSerializer):
@@ -55,16 +76,19 @@ class OfferListSerializer(OfferStatsMixin, serializers.ModelSerializer):
     Serializer for listing offers.
     """
     details = serializers.SerializerMethodField()
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
     user_details = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField('image')
 
     class Meta:
         model = Offer
         fields = [
-            'id', 'user', 'title', 'image',
+            'id', 'user', 'title', 'image', 'image_variants',
             'description', 'created_at', 'updated_at', 'details',
-            'min_price', 'min_delivery_time', 'user_details'
+            'min_price', 'min_delivery_time', 'max_delivery_time',
+            'user_details'
+        ]
+        read_only_fields = [
+            'min_price', 'min_delivery_time', 'max_delivery_time'
         ]
 
     def get_user_details(self, obj):
@@ -79,6 +103,30 @@ class OfferListSerializer(OfferStatsMixin, serializers.ModelSerializer):
         }
 
 
+class OfferBulkCreateSerializer(serializers.ListSerializer):
+    """
+    Serializer for creating a batch of offers with bulk inserts.
+    """
+
+    def create(self, validated_data):
+        """
+        Create all offers and their details in one transaction.
+        """
+        built = [self.child.build_offer(item) for item in validated_data]
+        offers = [offer for offer, details in built]
+        with transaction.atomic():
+            Offer.objects.bulk_create(offers)
+            details = OfferDetail.objects.bulk_create([
+                detail for offer, details in built
+                for detail in self.child.attach_details(offer, details)
+            ])
+            OfferFeature.index_details(details, replace=False)
+            OfferListCache.invalidate()
+            for offer in offers:
+                schedule_variants(offer.image)
+        return offers
+
+
 class OfferCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating a new offer.
@@ -88,6 +136,7 @@ class OfferCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Offer
         fields = ['id', 'title', 'image', 'description', 'details']
+        list_serializer_class = OfferBulkCreateSerializer
 
     def validate_details(self, value):
         """
@@ -99,16 +148,38 @@ class OfferCreateSerializer(serializers.ModelSerializer):
             })
         return value
 
+    def build_offer(self, validated_data):
+        """
+        Build an unsaved offer including stats and its unsaved details.
+        """
+        details = [
+            OfferDetail(**detail) for detail in validated_data.pop('details')
+        ]
+        offer = Offer(
+            user=self.context['request'].user,
+            **validated_data, **Offer.get_stats(details)
+        )
+        return offer, details
+
+    def attach_details(self, offer, details):
+        """
+        Attach unsaved details to a saved offer.
+        """
+        for detail in details:
+            detail.offer = offer
+        return details
+
     def create(self, validated_data):
         """
         Create a new offer.
         """
-        details_data = validated_data.pop('details')
-        offer = Offer.objects.create(
-            user=self.context['request'].user, **validated_data
-        )
-        for detail in details_data:
-            OfferDetail.objects.create(offer=offer, **detail)
+        offer, details = self.build_offer(validated_data)
+        with transaction.atomic():
+            offer.save()
+            OfferDetail.objects.bulk_create(
+                self.attach_details(offer, details))
+            OfferFeature.index_details(details, replace=False)
+            schedule_variants(offer.image)
         return offer
 
 
@@ -129,16 +200,16 @@ class OfferDetailRetrieveSerializer(OfferStatsMixin, serializers.ModelSerializer
     """
     user = serializers.IntegerField(source='id', read_only=True)
     details = serializers.SerializerMethodField()
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField('image')
 
     class Meta:
         model = Offer
         fields = [
-            'id', 'user', 'title', 'image',
+            'id', 'user', 'title', 'image', 'image_variants',
             'description', 'created_at', 'updated_at', 'details',
             'min_price', 'min_delivery_time'
         ]
+        read_only_fields = ['min_price', 'min_delivery_time']
 
 
 class OfferDetailUpdateSerializer(serializers.ModelSerializer):
@@ -151,13 +222,24 @@ class OfferDetailUpdateSerializer(serializers.ModelSerializer):
         model = Offer
         fields = ['id', 'title', 'image', 'description', 'details']
 
+    def validate_details(self, value):
+        """
+        Validate offer details to name each offer type at most once.
+        """
+        offer_types = [detail.get('offer_type') for detail in value]
+        if len(offer_types) != len(set(offer_types)):
+            raise serializers.ValidationError(
+                'Each offer_type may only be given once.')
+        return value
+
     def update(self, instance, validated_data):
         """
-        Update an offer.
+        Update an offer and its details in one transaction.
         """
-        self.update_offer_fields(instance, validated_data)
-        self.update_offer_detail_fields(
-            instance, validated_data.get('details', []))
+        details_data = validated_data.pop('details', [])
+        with transaction.atomic():
+            self.update_offer_detail_fields(instance, details_data)
+            self.update_offer_fields(instance, validated_data)
         return instance
 
     def update_offer_fields(self, instance, validated_data):
@@ -165,24 +247,36 @@ class OfferDetailUpdateSerializer(serializers.ModelSerializer):
         Update offer fields.
         """
         for attr, val in validated_data.items():
-            if attr != 'details':
-                setattr(instance, attr, val)
+            setattr(instance, attr, val)
         instance.save()
+        if 'image' in validated_data:
+            schedule_variants(instance.image)
 
     def update_offer_detail_fields(self, instance, details_data):
         """
-        Update offer detail fields.
+        Update offer detail fields with a single bulk update.
+
+        Details are taken from the prefetched details of the offer and
+        changed in place, so they can be serialized without a refetch.
         """
+        if not details_data:
+            return
+        details = {d.offer_type: d for d in instance.details.all()}
+        changed, fields = [], set()
         for detail_data in details_data:
             offer_type = detail_data.get('offer_type')
             if not offer_type:
                 raise serializers.ValidationError({
                     'offer_type': 'offer_type is required.'
                 })
-            try:
-                detail = instance.details.get(offer_type=offer_type)
-            except OfferDetail.DoesNotExist:
+            detail = details.get(offer_type)
+            if detail is None:
                 raise serializers.ValidationError({'detail': 'Not found.'})
             for key, value in detail_data.items():
                 setattr(detail, key, value)
-            detail.save()
+            changed.append(detail)
+            fields.update(detail_data)
+        OfferDetail.objects.bulk_update(changed, fields)
+        if 'features' in fields:
+            OfferFeature.index_details(changed)
+        instance.set_stats(Offer.get_stats(details.values()))
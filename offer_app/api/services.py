@@ -0,0 +1,399 @@
+# Standard libraries
+import hashlib
+import json
+import time
+from base64 import b64decode, b64encode
+from urllib.parse import urlencode
+
+# Third-party suppliers
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+# Local imports
+from offer_app.models import OfferTombstone
+
+
+class OfferListCache:
+    """
+    Cache of rendered offer list responses.
+
+    Entries are keyed by the catalog generation, which every offer
+    write replaces, so stale pages are never served.
+    """
+    GENERATION_KEY = 'offers:generation'
+    HITS_KEY = 'offers:hits'
+    MISSES_KEY = 'offers:misses'
+    KEY_PREFIX = 'offers:list'
+
+    @classmethod
+    def get_generation(cls):
+        """
+        Get the current catalog generation.
+        """
+        return cache.get_or_set(cls.GENERATION_KEY, time.time_ns(), None)
+
+    @classmethod
+    def bump_generation(cls):
+        """
+        Replace the catalog generation by a new one.
+        """
+        cache.set(cls.GENERATION_KEY, time.time_ns(), None)
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Invalidate cached pages now and once the transaction commits.
+        """
+        cls.bump_generation()
+        transaction.on_commit(cls.bump_generation)
+
+    @staticmethod
+    def is_cacheable(request):
+        """
+        Check a request to be a GET rendered as JSON.
+        """
+        renderer = getattr(request, 'accepted_renderer', None)
+        return request.method == 'GET' and getattr(
+            renderer, 'format', None) == 'json'
+
+    @classmethod
+    def get_key(cls, request):
+        """
+        Get the cache key of normalized query parameters of a request
+        and of its audience, as expanded profiles differ for anonymous
+        users.
+        """
+        audience = 'user' if request.user.is_authenticated else 'anon'
+        params = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values if value != ''
+        )
+        digest = hashlib.md5(
+            urlencode(params).encode(), usedforsecurity=False
+        ).hexdigest()
+        return ':'.join([
+            cls.KEY_PREFIX, str(cls.get_generation()),
+            request.accepted_media_type, audience, digest
+        ])
+
+    @classmethod
+    def get(cls, request):
+        """
+        Get the cached response of a request, if any.
+        """
+        if not cls.is_cacheable(request):
+            return None
+        request.offer_list_cache_key = cls.get_key(request)
+        cached = cache.get(request.offer_list_cache_key)
+        if cached is None:
+            cls.count(cls.MISSES_KEY)
+            return None
+        cls.count(cls.HITS_KEY)
+        content, content_type = cached
+        response = HttpResponse(content, content_type=content_type)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    @classmethod
+    def set(cls, request, response):
+        """
+        Store the rendered content of a successful response.
+        """
+        key = getattr(request, 'offer_list_cache_key', None)
+        if key is None or response.status_code != 200:
+            return
+        response.render()
+        cache.set(
+            key, (response.content, response['Content-Type']),
+            settings.OFFER_LIST_CACHE_TIMEOUT
+        )
+        response['X-Cache'] = 'MISS'
+
+    @staticmethod
+    def count(key):
+        """
+        Increase a hit or miss counter.
+        """
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+    @classmethod
+    def get_stats(cls):
+        """
+        Get hit and miss counters of the cache.
+        """
+        counters = cache.get_many([cls.HITS_KEY, cls.MISSES_KEY])
+        return {
+            'hits': counters.get(cls.HITS_KEY, 0),
+            'misses': counters.get(cls.MISSES_KEY, 0),
+            'generation': cls.get_generation(),
+        }
+
+
+class OfferValidators:
+    """
+    Validators (ETag and Last-Modified) for conditional offer GETs.
+    """
+
+    @staticmethod
+    def get_etag(*parts):
+        """
+        Get an ETag as hash of the given parts.
+        """
+        value = ':'.join(str(part) for part in parts)
+        return hashlib.md5(value.encode(), usedforsecurity=False).hexdigest()
+
+    @classmethod
+    def for_offer(cls, offer, expand=(), public=False):
+        """
+        Get validators of an offer by its update time and tier prices,
+        and by the update time and public or full profile of the creator
+        if expanded.
+        """
+        tiers = sorted((d.id, d.price) for d in offer.details.all())
+        parts = [offer.pk, offer.updated_at.isoformat(), tiers, sorted(expand)]
+        last_modified = offer.updated_at
+        if 'user' in expand:
+            parts.append(offer.user.uploaded_at.isoformat())
+            parts.append(public)
+            last_modified = max(last_modified, offer.user.uploaded_at)
+        return cls.get_etag(*parts), last_modified
+
+    @classmethod
+    def for_detail(cls, detail):
+        """
+        Get validators of an offer detail by its offer and price.
+        """
+        offer = detail.offer
+        etag = cls.get_etag(
+            offer.pk, offer.updated_at.isoformat(), detail.id, detail.price)
+        return etag, offer.updated_at
+
+    @classmethod
+    def for_list(cls, request):
+        """
+        Get validators of an offer list by the catalog generation.
+        """
+        return cls.get_etag(OfferListCache.get_key(request)), None
+
+
+class OfferFacetService:
+    """
+    Service to count filtered offers by price, delivery time and creator.
+    """
+    PRICE_EDGES = [50, 100, 250, 500, 1000]
+    DELIVERY_EDGES = [3, 7, 14, 30]
+    CREATOR_LIMIT = 20
+
+    @staticmethod
+    def get_buckets(edges):
+        """
+        Get (lower, upper) bounds of the buckets between the edges.
+        """
+        bounds = [None, *edges, None]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    @classmethod
+    def get_bucket_counts(cls, queryset):
+        """
+        Get bucket counts of min price and max delivery time in one
+        aggregate query. Price buckets include their lower bound and
+        delivery time buckets their upper bound, like the filters.
+        """
+        price_buckets = cls.get_buckets(cls.PRICE_EDGES)
+        delivery_buckets = cls.get_buckets(cls.DELIVERY_EDGES)
+        aggregates = {'count': Count('pk')}
+        for idx, (lower, upper) in enumerate(price_buckets):
+            condition = Q()
+            if lower is not None:
+                condition &= Q(min_price__gte=lower)
+            if upper is not None:
+                condition &= Q(min_price__lt=upper)
+            aggregates[f'price_{idx}'] = Count(
+                'pk', filter=condition & Q(min_price__isnull=False))
+        for idx, (lower, upper) in enumerate(delivery_buckets):
+            condition = Q()
+            if lower is not None:
+                condition &= Q(max_delivery_time__gt=lower)
+            if upper is not None:
+                condition &= Q(max_delivery_time__lte=upper)
+            aggregates[f'delivery_{idx}'] = Count(
+                'pk', filter=condition & Q(max_delivery_time__isnull=False))
+
+        counts = queryset.order_by().aggregate(**aggregates)
+        return {
+            'count': counts['count'],
+            'min_price': [
+                {'from': lower, 'to': upper, 'count': counts[f'price_{idx}']}
+                for idx, (lower, upper) in enumerate(price_buckets)
+            ],
+            'max_delivery_time': [
+                {'from': lower, 'to': upper,
+                 'count': counts[f'delivery_{idx}']}
+                for idx, (lower, upper) in enumerate(delivery_buckets)
+            ],
+        }
+
+    @classmethod
+    def get_creator_counts(cls, queryset):
+        """
+        Get offer counts of the creators with the most offers.
+        """
+        rows = (
+            queryset.order_by()
+            .values('user', 'user__username')
+            .annotate(count=Count('pk'))
+            .order_by('-count', 'user')[:cls.CREATOR_LIMIT]
+        )
+        return [
+            {'user': r['user'], 'username': r['user__username'],
+             'count': r['count']}
+            for r in rows
+        ]
+
+    @staticmethod
+    def get_price_histogram(queryset, bin_width):
+        """
+        Get offer counts per min price bin of the given width.
+        """
+        rows = (
+            queryset.order_by()
+            .filter(min_price__isnull=False)
+            .annotate(bin=F('min_price') / bin_width)
+            .values('bin')
+            .annotate(count=Count('pk'))
+            .order_by('bin')
+        )
+        return {
+            'bin_width': bin_width,
+            'bins': [
+                {'from': r['bin'] * bin_width,
+                 'to': (r['bin'] + 1) * bin_width, 'count': r['count']}
+                for r in rows
+            ],
+        }
+
+    @classmethod
+    def get_facets(cls, queryset, bin_width):
+        """
+        Get all facets of the filtered offers.
+        """
+        return {
+            **cls.get_bucket_counts(queryset),
+            'creator': cls.get_creator_counts(queryset),
+            'price_histogram': cls.get_price_histogram(queryset, bin_width),
+        }
+
+
+class OfferChangeFeed:
+    """
+    Feed of offers changed and deleted after a position.
+
+    Offers and tombstones are read as two keyset streams ordered by
+    (updated_at, id) and (deleted_at, id), and the cursor holds the
+    position in both, so a sync costs the number of changes.
+    """
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def __init__(self, changed_since=None, cursor=None):
+        """
+        Start the feed at a cursor, a timestamp or the beginning.
+        """
+        if cursor is not None:
+            self.offer_pos, self.tombstone_pos = self.decode_cursor(cursor)
+        elif changed_since is not None:
+            self.offer_pos = self.tombstone_pos = (changed_since, None)
+        else:
+            self.offer_pos, self.tombstone_pos = None, (timezone.now(), None)
+
+    @staticmethod
+    def after(queryset, field, position):
+        """
+        Filter rows after a (timestamp, id) position in ascending order,
+        or after the timestamp only if the position has no id.
+        """
+        if position is None:
+            return queryset
+        value, pk = position
+        if pk is None:
+            return queryset.filter(**{f'{field}__gt': value})
+        return queryset.filter(
+            Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk})
+        )
+
+    def get_page(self, queryset, size):
+        """
+        Get changed offers and deleted offer ids up to the page size.
+        """
+        offers = list(
+            self.after(queryset, 'updated_at', self.offer_pos)
+            .order_by('updated_at', 'pk')[:size + 1]
+        )
+        tombstones = list(
+            self.after(
+                OfferTombstone.objects.all(), 'deleted_at', self.tombstone_pos
+            ).order_by('deleted_at', 'pk')[:size + 1]
+        )
+        self.has_more = len(offers) > size or len(tombstones) > size
+        offers, tombstones = offers[:size], tombstones[:size]
+        if offers:
+            self.offer_pos = (offers[-1].updated_at, offers[-1].pk)
+        if tombstones:
+            self.tombstone_pos = (
+                tombstones[-1].deleted_at, tombstones[-1].pk)
+        return offers, tombstones
+
+    def encode_cursor(self):
+        """
+        Get a cursor positioned after the rows read so far.
+        """
+        offer_pos = self.offer_pos or (None, None)
+        data = {
+            'u': offer_pos[0] and offer_pos[0].isoformat(),
+            'o': offer_pos[1],
+            'd': self.tombstone_pos[0].isoformat(),
+            't': self.tombstone_pos[1],
+        }
+        return b64encode(json.dumps(data).encode('ascii')).decode('ascii')
+
+    @classmethod
+    def decode_cursor(cls, encoded):
+        """
+        Get the offer and tombstone positions of a cursor.
+        """
+        try:
+            data = json.loads(b64decode(encoded.encode('ascii')))
+            offer_pos = None
+            if data['u'] is not None:
+                offer_pos = (cls.parse(data['u']), cls.parse_id(data['o']))
+            tombstone_pos = (cls.parse(data['d']), cls.parse_id(data['t']))
+        except (TypeError, ValueError, KeyError, AttributeError):
+            raise ValidationError({'cursor': cls.invalid_cursor_message})
+        return offer_pos, tombstone_pos
+
+    @staticmethod
+    def parse(value):
+        """
+        Parse a timestamp of a cursor.
+        """
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(value)
+        return parsed
+
+    @staticmethod
+    def parse_id(value):
+        """
+        Parse an id of a cursor, which is empty before the first row.
+        """
+        return None if value is None else int(value)
@@ -2,10 +2,23 @@
 from django.urls import path
 
 # Local imports
-from .views import OfferDetailView, OfferListCreateAPIView
+from .views import (
+    OfferChangeFeedAPIView, OfferDetailView, OfferFacetsAPIView,
+    OfferListCacheStatsAPIView, OfferListCreateAPIView
+)
 
 
 urlpatterns = [
     path('', OfferListCreateAPIView.as_view(), name='offer-list-create'),
+    path('facets/', OfferFacetsAPIView.as_view(), name='offer-facets'),
+    path(
+        'changes/', OfferChangeFeedAPIView.as_view(),
+        name='offer-change-feed'
+    ),
+    path(
+        'cache-stats/',
+        OfferListCacheStatsAPIView.as_view(),
+        name='offer-list-cache-stats'
+    ),
     path('<int:pk>/', OfferDetailView.as_view(), name='offer-detail'),
 ]
@@ -1,18 +1,31 @@
 # Third-party suppliers
-from django.db.models import Max, Min
+from django.db.models import prefetch_related_objects
+from django.utils.cache import patch_vary_headers
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, status
+from rest_framework import filters, serializers, status
 from rest_framework.generics import (
-    GenericAPIView, RetrieveAPIView, RetrieveUpdateDestroyAPIView
+    GenericAPIView, ListAPIView, RetrieveAPIView,
+    RetrieveUpdateDestroyAPIView
+)
+from rest_framework.permissions import (
+    AllowAny, IsAdminUser, IsAuthenticated
 )
-from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
 
 # Local imports
-from offer_app.api.filters import OfferFilter
+from core.api.mixins import (
+    ConditionalGetMixin, ExpandMixin, SparseFieldsMixin, StreamingExportMixin
+)
+from core.api.params import get_id_list, get_query_value
+from offer_app.api.filters import OfferFilter, OfferSearchFilter
 from offer_app.models import Offer, OfferDetail
-from .paginations import OfferPagination
+from .paginations import OfferCursorPagination, OfferPagination
 from .permissions import IsBusinessUser, IsOwnerOrReadOnly
+from .services import (
+    OfferChangeFeed, OfferFacetService, OfferListCache, OfferValidators
+)
 from .serializers import (
     OfferCreateSerializer, OfferDetailNestedSerializer,
     OfferDetailRetrieveSerializer, OfferDetailSerializer,
@@ -20,32 +33,55 @@ from .serializers import (
 )
 
 
-class OfferListCreateAPIView(GenericAPIView):
+class OfferListCreateAPIView(
+    ConditionalGetMixin, ExpandMixin, SparseFieldsMixin,
+    StreamingExportMixin, GenericAPIView
+):
     """
     View for listing and creating offers.
     """
-    queryset = Offer.objects.all().prefetch_related('details')
+    queryset = Offer.objects.all()
     pagination_class = OfferPagination
     filter_backends = [
-        DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter
+        DjangoFilterBackend, filters.OrderingFilter, OfferSearchFilter
     ]
     filterset_class = OfferFilter
     search_fields = ['title', 'description']
     ordering_fields = ['updated_at', 'min_price']
     ordering = ['-updated_at']
+    batch_max_size = 100
+    export_filename = 'offers'
+    expandable_fields = ['details', 'user']
+    sparse_field_sources = {
+        'details': [],
+        'image_variants': ['image', 'image_variants'],
+        'user_details': [
+            'user', 'user__first_name', 'user__last_name', 'user__username'
+        ],
+    }
 
     def get_queryset(self):
         """
-        Get queryset including virtual fields.
+        Get queryset loading related objects of requested fields only.
         """
-        return (
-            Offer.objects
-                 .annotate(
-                     min_price=Min('details__price'),
-                     max_delivery_time=Max('details__delivery_time_in_days'),
-                 )
-            .prefetch_related('details')
-        )
+        queryset = super().get_queryset()
+        if self.is_field_requested('details'):
+            queryset = queryset.prefetch_related('details')
+        if self.is_field_requested('user_details') or self.is_expanded('user'):
+            queryset = queryset.select_related('user')
+        return queryset
+
+    @property
+    def paginator(self):
+        """
+        Get the keyset paginator if requested, else the page paginator.
+        """
+        if not hasattr(self, '_paginator'):
+            if OfferCursorPagination.is_requested(self.request):
+                self._paginator = OfferCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def get_serializer_class(self):
         """
@@ -65,17 +101,43 @@ class OfferListCreateAPIView(GenericAPIView):
 
     def get(self, request):
         """
-        Get offer list.
+        Get offer list, served from the cache if possible.
         """
+        not_modified = self.get_not_modified_response(
+            request, *OfferValidators.for_list(request))
+        if not_modified:
+            return not_modified
+        cached = OfferListCache.get(request)
+        if cached is not None:
+            return cached
         queryset = self.filter_queryset(self.get_queryset())
+        if self.is_export():
+            return self.get_export_response(queryset)
         page = self.paginate_queryset(queryset)
         serializer = self.get_serializer(page, many=True)
         return self.get_paginated_response(serializer.data)
 
+    def finalize_response(self, request, response, *args, **kwargs):
+        """
+        Finalize a response and store it in the offer list cache.
+
+        Expanded creator profiles depend on the authentication, so the
+        response varies by it.
+        """
+        response = super().finalize_response(
+            request, response, *args, **kwargs)
+        if self.is_expanded('user'):
+            patch_vary_headers(response, ['Authorization'])
+        if isinstance(response, Response):
+            OfferListCache.set(request, response)
+        return response
+
     def post(self, request):
         """
-        Add new offer.
+        Add new offer, or a batch of offers given as a list.
         """
+        if isinstance(request.data, list):
+            return self.post_batch(request)
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         offer = serializer.save()
@@ -84,13 +146,136 @@ class OfferListCreateAPIView(GenericAPIView):
             status=status.HTTP_201_CREATED
         )
 
+    def post_batch(self, request):
+        """
+        Add a batch of offers, validating every offer before saving any.
+        """
+        serializer = self.get_serializer(
+            data=request.data, many=True,
+            allow_empty=False, max_length=self.batch_max_size
+        )
+        serializer.is_valid(raise_exception=True)
+        offers = serializer.save()
+        prefetch_related_objects(offers, 'details')
+        return Response(
+            self.get_serializer(offers, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class OfferFacetsAPIView(GenericAPIView):
+    """
+    View for counting filtered offers by price, delivery time and creator.
+    """
+    queryset = Offer.objects.all()
+    permission_classes = [AllowAny]
+    filter_backends = [DjangoFilterBackend, OfferSearchFilter]
+    filterset_class = OfferFilter
+    search_fields = ['title', 'description']
+    search_ranking = False
+    bin_width_query_param = 'bin_width'
+    default_bin_width = 50
+    max_bin_width = 10000
+
+    def get(self, request):
+        """
+        Get facets of the offers matching the filters and search.
+        """
+        bin_width = get_query_value(
+            request, self.bin_width_query_param,
+            serializers.IntegerField(
+                min_value=1, max_value=self.max_bin_width),
+            self.default_bin_width
+        )
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(OfferFacetService.get_facets(queryset, bin_width))
+
 
-class OfferDetailView(RetrieveUpdateDestroyAPIView):
+class OfferChangeFeedAPIView(GenericAPIView):
+    """
+    View for listing offers changed or deleted since a timestamp or a
+    cursor of a previous sync.
+    """
+    queryset = Offer.objects.select_related('user').prefetch_related(
+        'details')
+    serializer_class = OfferListSerializer
+    permission_classes = [AllowAny]
+    changed_since_query_param = 'changed_since'
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 100
+    max_page_size = 500
+
+    def get_serializer_context(self):
+        """
+        Get serializer context rendering the complete tiers.
+        """
+        return {**super().get_serializer_context(), 'detailed': True}
+
+    def get(self, request):
+        """
+        Get the next page of changes and the cursor to continue with.
+        """
+        feed = OfferChangeFeed(
+            changed_since=get_query_value(
+                request, self.changed_since_query_param,
+                serializers.DateTimeField()
+            ),
+            cursor=request.query_params.get(self.cursor_query_param),
+        )
+        page_size = get_query_value(
+            request, self.page_size_query_param,
+            serializers.IntegerField(
+                min_value=1, max_value=self.max_page_size),
+            self.page_size
+        )
+        offers, tombstones = feed.get_page(self.get_queryset(), page_size)
+        cursor = feed.encode_cursor()
+        url = remove_query_param(
+            request.build_absolute_uri(), self.changed_since_query_param)
+        return Response({
+            'results': self.get_serializer(offers, many=True).data,
+            'deleted': [
+                {'id': t.offer_id, 'deleted_at': t.deleted_at}
+                for t in tombstones
+            ],
+            'has_more': feed.has_more,
+            'cursor': cursor,
+            'next': replace_query_param(url, self.cursor_query_param, cursor),
+        })
+
+
+class OfferListCacheStatsAPIView(APIView):
+    """
+    View for retrieving hit and miss counters of the offer list cache.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        Get offer list cache stats.
+        """
+        return Response(OfferListCache.get_stats())
+
+
+class OfferDetailView(
+    ConditionalGetMixin, ExpandMixin, RetrieveUpdateDestroyAPIView
+):
     """
     View for getting, updating and deleting offers.
     """
     queryset = Offer.objects.prefetch_related('details')
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
+    expandable_fields = ['details', 'user']
+
+    def get_queryset(self):
+        """
+        Get queryset loading the creator if expanded.
+        """
+        queryset = super().get_queryset()
+        if self.is_expanded('user'):
+            queryset = queryset.select_related('user')
+        return queryset
 
     def get_serializer_class(self):
         """
@@ -105,6 +290,13 @@ class OfferDetailView(RetrieveUpdateDestroyAPIView):
         Get an offer.
         """
         offer = self.get_object()
+        not_modified = self.get_not_modified_response(
+            request, *OfferValidators.for_offer(
+                offer, self.get_expand(),
+                public=not request.user.is_authenticated
+            ))
+        if not_modified:
+            return not_modified
         serializer = self.get_serializer(offer)
         return Response(serializer.data)
 
@@ -121,8 +313,6 @@ class OfferDetailView(RetrieveUpdateDestroyAPIView):
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
-
-        offer.refresh_from_db()
         return Response(OfferDetailSerializer(offer, context={'detailed': True}).data)
 
     def delete(self, request, *args, **kwargs):
@@ -135,10 +325,44 @@ class OfferDetailView(RetrieveUpdateDestroyAPIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class OfferDetailRetrieveAPIView(RetrieveAPIView):
+class OfferDetailRetrieveAPIView(ConditionalGetMixin, RetrieveAPIView):
     """
     View for retrieving offer details.
     """
+    queryset = OfferDetail.objects.select_related('offer')
+    serializer_class = OfferDetailNestedSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Get an offer detail.
+        """
+        detail = self.get_object()
+        not_modified = self.get_not_modified_response(
+            request, *OfferValidators.for_detail(detail))
+        if not_modified:
+            return not_modified
+        return Response(self.get_serializer(detail).data)
+
+
+class OfferDetailListAPIView(ListAPIView):
+    """
+    View for retrieving many offer details by their ids at once.
+    """
     queryset = OfferDetail.objects.all()
     serializer_class = OfferDetailNestedSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = None
+    filter_backends = []
+    ids_query_param = 'ids'
+    max_ids = 100
+
+    def list(self, request, *args, **kwargs):
+        """
+        Get the existing offer details of the requested ids in order.
+        """
+        ids = get_id_list(request, self.ids_query_param, self.max_ids)
+        details = self.get_queryset().in_bulk(ids)
+        serializer = self.get_serializer(
+            [details[pk] for pk in ids if pk in details], many=True)
+        return Response(serializer.data)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class OfferAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'offer_app'
+
+    def ready(self):
+        """
+        Connect offer signal receivers.
+        """
+        from offer_app import signals  # noqa: F401
@@ -0,0 +1,79 @@
+# Standard libraries
+from concurrent.futures import as_completed
+from functools import partial
+
+# Third-party suppliers
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+# Local imports
+from auth_app.models import CustomUser
+from core.images import get_executor, render_variants, save_variants
+from offer_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Render missing image variants of offer images and profile pictures.
+    """
+    help = 'Render image variants of existing offer and profile images.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+        """
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Render variants again, even if they exist.'
+        )
+
+    def get_targets(self, force):
+        """
+        Get (model_label, pk, field_name, name) of stored images lacking
+        variants.
+        """
+        for model, field_name in [(Offer, 'image'), (CustomUser, 'file')]:
+            rows = (
+                model.objects.exclude(**{field_name: ''})
+                .exclude(**{f'{field_name}__isnull': True})
+                .values_list('pk', field_name, f'{field_name}_variants')
+            )
+            for pk, name, variants in rows.iterator():
+                if not force and set(settings.IMAGE_VARIANTS) <= set(variants):
+                    continue
+                if default_storage.exists(name):
+                    yield (model._meta.label, pk, field_name, name)
+
+    def handle(self, *args, **options):
+        """
+        Render variants on the process pool, store them and report the
+        results.
+        """
+        targets = list(self.get_targets(options['force']))
+        media_root = str(settings.MEDIA_ROOT)
+        variants = settings.IMAGE_VARIANTS
+        if settings.IMAGE_VARIANT_WORKERS:
+            futures = {
+                get_executor().submit(
+                    render_variants, media_root, target[3], variants): target
+                for target in targets
+            }
+            jobs = ((futures[f], f.result) for f in as_completed(futures))
+        else:
+            jobs = (
+                (target, partial(
+                    render_variants, media_root, target[3], variants))
+                for target in targets
+            )
+
+        rendered = 0
+        for target, run in jobs:
+            try:
+                save_variants(*target, run())
+                rendered += 1
+            except Exception as exc:
+                self.stderr.write(f'{target[3]}: {exc}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Rendered variants of {rendered} of {len(targets)} images.'
+        ))
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.4 on 2026-10-18 17:17
+
+from django.db import migrations, models
+from django.db.models import Max, Min
+
+
+def populate_offer_stats(apps, schema_editor):
+    """
+    Fill the offer stats from the existing offer details.
+    """
+    Offer = apps.get_model('offer_app', 'Offer')
+    OfferDetail = apps.get_model('offer_app', 'OfferDetail')
+    stats = (
+        OfferDetail.objects.order_by()
+        .values('offer_id')
+        .annotate(
+            min_price=Min('price'),
+            min_delivery_time=Min('delivery_time_in_days'),
+            max_delivery_time=Max('delivery_time_in_days'),
+        )
+    )
+    for row in stats:
+        Offer.objects.filter(pk=row.pop('offer_id')).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offer_app', '0009_alter_offerdetail_revisions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='max_delivery_time',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(populate_offer_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from offer_app.search import install_search_index, uninstall_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offer_app', '0011_offer_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
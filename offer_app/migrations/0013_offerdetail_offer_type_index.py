@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-18 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offer_app', '0012_offer_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offerdetail',
+            index=models.Index(fields=['offer', 'offer_type'], name='offer_app_o_offer_i_46ebf8_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.4 on 2026-10-18 17:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_offer_features(apps, schema_editor):
+    """
+    Fill the feature index from the features of existing offer details.
+    """
+    OfferDetail = apps.get_model('offer_app', 'OfferDetail')
+    OfferFeature = apps.get_model('offer_app', 'OfferFeature')
+    rows = []
+    for detail in OfferDetail.objects.only('offer_id', 'features').iterator():
+        names = {
+            ' '.join(str(name).split()).casefold()[:255]
+            for name in detail.features or []
+        }
+        rows += [
+            OfferFeature(
+                offer_id=detail.offer_id, offer_detail_id=detail.pk,
+                name=name
+            )
+            for name in sorted(names) if name
+        ]
+    OfferFeature.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offer_app', '0013_offerdetail_offer_type_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferFeature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feature_index', to='offer_app.offer')),
+                ('offer_detail', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feature_index', to='offer_app.offerdetail')),
+            ],
+            options={
+                'verbose_name': 'Offer Feature',
+                'verbose_name_plural': 'Offer Features',
+                'indexes': [models.Index(fields=['name', 'offer'], name='offer_app_o_name_dae0e0_idx')],
+                'constraints': [models.UniqueConstraint(fields=('offer_detail', 'name'), name='unique_offer_detail_feature')],
+            },
+        ),
+        migrations.RunPython(
+            populate_offer_features, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-18 17:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offer_app', '0014_offer_feature_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('offer_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Offer Tombstone',
+                'verbose_name_plural': 'Offer Tombstones',
+                'ordering': ['deleted_at', 'id'],
+                'indexes': [models.Index(fields=['deleted_at', 'id'], name='offer_app_o_deleted_083038_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:17
+
+from django.db import migrations, models
+
+from offer_app.search import install_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offer_app', '0015_offer_tombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        # Adding the column rebuilds offer_app_offer on SQLite, which
+        # drops the triggers of the search index.
+        migrations.RunPython(install_search_index, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,7 @@
 # Third-party suppliers
 from django.db import models
+from django.db.models import Max, Min
+from django.utils import timezone
 
 # Local imports
 from auth_app.models import CustomUser
@@ -14,12 +16,24 @@ class Offer(models.Model):
     )
     title = models.CharField(max_length=100, blank=False, default='')
     image = models.ImageField(upload_to='offers/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True)
     description = models.TextField(max_length=500, default='')
+    min_price = models.IntegerField(null=True, blank=True)
+    min_delivery_time = models.IntegerField(
+        null=True, blank=True, db_index=True
+    )
+    max_delivery_time = models.IntegerField(
+        null=True, blank=True, db_index=True
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+            models.Index(fields=['min_price', 'id']),
+        ]
         verbose_name = "Offer"
         verbose_name_plural = "Offers"
 
@@ -29,6 +43,47 @@ class Offer(models.Model):
         """
         return f"{self.title} by {self.user.username}"
 
+    @staticmethod
+    def get_stats(details):
+        """
+        Get price and delivery time stats of the given offer details.
+        """
+        prices = [d.price for d in details]
+        times = [d.delivery_time_in_days for d in details]
+        return {
+            'min_price': min(prices, default=None),
+            'min_delivery_time': min(times, default=None),
+            'max_delivery_time': max(times, default=None),
+        }
+
+    def update_stats(self, details=None):
+        """
+        Update the stored price and delivery time stats of an offer.
+
+        Stats are computed from the given details in memory, otherwise
+        they are aggregated from the database. The update time is
+        touched too, as the tiers are part of the offer.
+        """
+        if details is None:
+            stats = OfferDetail.objects.filter(offer_id=self.pk).aggregate(
+                min_price=Min('price'),
+                min_delivery_time=Min('delivery_time_in_days'),
+                max_delivery_time=Max('delivery_time_in_days'),
+            )
+        else:
+            stats = self.get_stats(details)
+        self.set_stats(stats)
+        self.updated_at = timezone.now()
+        Offer.objects.filter(pk=self.pk).update(
+            updated_at=self.updated_at, **stats)
+
+    def set_stats(self, stats):
+        """
+        Set price and delivery time stats without saving.
+        """
+        for attr, val in stats.items():
+            setattr(self, attr, val)
+
 
 class OfferDetail(models.Model):
     """
@@ -48,9 +103,90 @@ class OfferDetail(models.Model):
         verbose_name = "Offer Detail"
         verbose_name_plural = "Offer Details"
         ordering = ['price']
+        indexes = [models.Index(fields=['offer', 'offer_type'])]
 
     def __str__(self):
         """
         Get a string representing an offer detail.
         """
         return f"{self.offer_type.title()} - {self.title} (${self.price})"
+
+
+class OfferFeature(models.Model):
+    """
+    Represents a normalized feature of an offer detail, indexing the
+    features list so offers can be filtered by feature.
+    """
+    offer = models.ForeignKey(
+        Offer, on_delete=models.CASCADE, related_name="feature_index"
+    )
+    offer_detail = models.ForeignKey(
+        OfferDetail, on_delete=models.CASCADE, related_name="feature_index"
+    )
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        verbose_name = "Offer Feature"
+        verbose_name_plural = "Offer Features"
+        indexes = [models.Index(fields=['name', 'offer'])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['offer_detail', 'name'],
+                name='unique_offer_detail_feature'
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Get a string representing an offer feature.
+        """
+        return self.name
+
+    @staticmethod
+    def normalize(name):
+        """
+        Get a feature name without case and extra whitespace.
+        """
+        return ' '.join(str(name).split()).casefold()[:255]
+
+    @classmethod
+    def build(cls, detail):
+        """
+        Build the unsaved index rows of an offer detail.
+        """
+        names = {cls.normalize(name) for name in detail.features or []}
+        return [
+            cls(offer_id=detail.offer_id, offer_detail=detail, name=name)
+            for name in sorted(names) if name
+        ]
+
+    @classmethod
+    def index_details(cls, details, replace=True):
+        """
+        Write the index rows of saved offer details, replacing their
+        previous rows unless the details are new.
+        """
+        if replace:
+            cls.objects.filter(offer_detail__in=details).delete()
+        cls.objects.bulk_create(
+            [row for detail in details for row in cls.build(detail)])
+
+
+class OfferTombstone(models.Model):
+    """
+    Represents a deleted offer, so change feeds can report its deletion.
+    """
+    offer_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Offer Tombstone"
+        verbose_name_plural = "Offer Tombstones"
+        ordering = ['deleted_at', 'id']
+        indexes = [models.Index(fields=['deleted_at', 'id'])]
+
+    def __str__(self):
+        """
+        Get a string representing an offer tombstone.
+        """
+        return f"Offer {self.offer_id} deleted at {self.deleted_at}"
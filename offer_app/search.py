@@ -0,0 +1,97 @@
+# Standard libraries
+import re
+
+# Third-party suppliers
+from django.db import connection
+
+SEARCH_TABLE = 'offer_app_offer_fts'
+
+# The index is an external content FTS5 table fed by triggers, so every
+# write to offer_app_offer keeps it in sync. SQLite drops the triggers
+# when a migration rebuilds offer_app_offer, so such migrations must
+# run install_search_index() again.
+SEARCH_INDEX_SQL = [
+    f'''
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        title, description,
+        content='offer_app_offer', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai
+    AFTER INSERT ON offer_app_offer BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad
+    AFTER DELETE ON offer_app_offer BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au
+    AFTER UPDATE OF title, description ON offer_app_offer BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    ''',
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_SEARCH_INDEX_SQL = [
+    f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_au',
+    f'DROP TABLE IF EXISTS {SEARCH_TABLE}',
+]
+
+# Matching rows ranked by bm25, where a title hit weighs twice as much.
+MATCH_SQL = f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s'
+RANK_SQL = (
+    f'SELECT bm25({SEARCH_TABLE}, 2.0, 1.0) FROM {SEARCH_TABLE} '
+    f'WHERE {SEARCH_TABLE} MATCH %s '
+    f'AND {SEARCH_TABLE}.rowid = offer_app_offer.id'
+)
+
+
+def is_search_index_supported(conn=connection):
+    """
+    Check the database to support the full-text search index.
+    """
+    return conn.vendor == 'sqlite'
+
+
+def install_search_index(apps, schema_editor):
+    """
+    Create the full-text search index of offers and fill it.
+    """
+    if is_search_index_supported(schema_editor.connection):
+        for sql in SEARCH_INDEX_SQL:
+            schema_editor.execute(sql)
+
+
+def uninstall_search_index(apps, schema_editor):
+    """
+    Drop the full-text search index of offers.
+    """
+    if is_search_index_supported(schema_editor.connection):
+        for sql in DROP_SEARCH_INDEX_SQL:
+            schema_editor.execute(sql)
+
+
+def get_match_query(terms):
+    """
+    Get an FTS5 query requiring every term, each matched as a prefix.
+    """
+    phrases = []
+    for term in terms:
+        tokens = re.findall(r'\w+', term)
+        if tokens:
+            phrases.append('"{}"*'.format(' '.join(tokens)))
+    return ' '.join(phrases)
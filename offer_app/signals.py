@@ -0,0 +1,88 @@
+# Third-party suppliers
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Local imports
+from auth_app.models import CustomUser
+from core.images import variants_rendered
+from offer_app.api.services import OfferListCache
+from offer_app.models import (
+    Offer, OfferDetail, OfferFeature, OfferTombstone
+)
+
+USER_DETAIL_FIELDS = {'first_name', 'last_name', 'username'}
+
+
+def is_detail_origin(origin):
+    """
+    Check a delete to be started from offer details, not from a cascade.
+    """
+    return (
+        isinstance(origin, OfferDetail)
+        or getattr(origin, 'model', None) is OfferDetail
+    )
+
+
+@receiver(post_save, sender=OfferDetail)
+def update_stats_on_save(sender, instance, **kwargs):
+    """
+    Update offer stats after saving an offer detail.
+    """
+    instance.offer.update_stats()
+
+
+@receiver(post_save, sender=OfferDetail)
+def index_features_on_save(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    """
+    Update the feature index after saving an offer detail.
+    """
+    if update_fields is None or 'features' in update_fields:
+        OfferFeature.index_details([instance], replace=not created)
+
+
+@receiver(post_delete, sender=OfferDetail)
+def update_stats_on_delete(sender, instance, origin=None, **kwargs):
+    """
+    Update offer stats after deleting an offer detail.
+    """
+    if is_detail_origin(origin):
+        instance.offer.update_stats()
+
+
+@receiver(post_delete, sender=Offer)
+def add_tombstone_on_delete(sender, instance, **kwargs):
+    """
+    Record a deleted offer for the offer change feed.
+    """
+    OfferTombstone.objects.create(offer_id=instance.pk)
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_offer_list_cache(sender, **kwargs):
+    """
+    Invalidate cached offer lists after an offer write.
+    """
+    OfferListCache.invalidate()
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_offer_list_cache_on_user(sender, update_fields=None, **kwargs):
+    """
+    Invalidate cached offer lists after changing user details.
+    """
+    if update_fields is None or USER_DETAIL_FIELDS & set(update_fields):
+        OfferListCache.invalidate()
+
+
+@receiver(variants_rendered, sender=Offer)
+@receiver(variants_rendered, sender=CustomUser)
+def invalidate_offer_list_cache_on_variants(sender, **kwargs):
+    """
+    Invalidate cached offer lists after image variants are stored.
+    """
+    OfferListCache.bump_generation()
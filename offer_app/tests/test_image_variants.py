@@ -0,0 +1,140 @@
+# Standard libraries
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+# Third-party suppliers
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Local imports
+from core.images import save_variants
+from offer_app.api.services import OfferListCache
+from offer_app.models import Offer
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def get_image_file(name='photo.png', size=(1600, 1200)):
+    """
+    Get an uploaded PNG image.
+    """
+    buffer = BytesIO()
+    Image.new('RGB', size, 'orange').save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/png')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_VARIANT_WORKERS=0)
+class ImageVariantTests(APITestCase):
+    """
+    Tests for rendering image variants of offers and profiles.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Remove the temporary media files.
+        """
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        """
+        Set up a business user with an offer.
+        """
+        self.business = User.objects.create_user(
+            username='biz', password='pass', type='business'
+        )
+        self.offer = Offer.objects.create(
+            user=self.business, title='Logo Design', description='Desc'
+        )
+
+    def test_patch_offer_image_renders_variants(self):
+        """
+        Ensure an uploaded offer image gets its variants rendered.
+        """
+        self.client.force_authenticate(self.business)
+        url = f'/api/offers/{self.offer.pk}/'
+        generation = OfferListCache.get_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.patch(
+                url, {'image': get_image_file()}, format='multipart')
+            patched_at = Offer.objects.get(pk=self.offer.pk).updated_at
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.offer.refresh_from_db()
+        self.assertEqual(set(self.offer.image_variants), {'thumbnail', 'web'})
+        self.assertGreater(self.offer.updated_at, patched_at)
+        self.assertNotEqual(OfferListCache.get_generation(), generation)
+        name = self.offer.image_variants['thumbnail']
+        with Image.open(os.path.join(MEDIA_ROOT, name)) as thumbnail:
+            self.assertEqual(thumbnail.size, (320, 240))
+            self.assertEqual(thumbnail.format, 'WEBP')
+
+        res = self.client.get(url)
+        self.assertRegex(
+            res.data['image_variants']['web'], r'\.web\.[0-9a-f]{12}\.webp$')
+
+    def test_variants_of_replaced_image_are_not_stored(self):
+        """
+        Ensure variants rendered for a replaced image are dropped and
+        pending variants are listed as None.
+        """
+        self.offer.image = get_image_file()
+        self.offer.save()
+        updated = save_variants(
+            'offer_app.Offer', self.offer.pk, 'image', 'offers/old.png',
+            {'web': 'offers/variants/old.web.webp'}
+        )
+        self.assertEqual(updated, 0)
+        self.client.force_authenticate(self.business)
+        res = self.client.get(f'/api/offers/{self.offer.pk}/')
+        self.assertEqual(
+            res.data['image_variants'], {'thumbnail': None, 'web': None})
+
+    def test_profile_without_picture_has_no_variants(self):
+        """
+        Ensure a profile without picture has no variant urls.
+        """
+        self.client.force_authenticate(self.business)
+        res = self.client.get(f'/api/profile/{self.business.pk}/')
+        self.assertIsNone(res.data['file_variants'])
+
+    def test_command_renders_missing_variants(self):
+        """
+        Ensure the command renders variants of existing images.
+        """
+        self.business.file = get_image_file('avatar.png', (400, 400))
+        self.business.save()
+        call_command('generate_image_variants', stdout=StringIO())
+        self.business.refresh_from_db()
+        name = self.business.file_variants['web']
+        self.assertTrue(os.path.exists(os.path.join(MEDIA_ROOT, name)))
+
+    def test_command_renders_changed_image_to_new_names(self):
+        """
+        Ensure re-rendered variants get new names instead of replacing
+        files served as immutable.
+        """
+        self.business.file = get_image_file('avatar.png', (400, 400))
+        self.business.save()
+        call_command('generate_image_variants', stdout=StringIO())
+        self.business.refresh_from_db()
+        old_name = self.business.file_variants['web']
+
+        changed = Image.new('RGB', (400, 400), 'navy')
+        changed.save(self.business.file.path, 'PNG')
+        call_command('generate_image_variants', '--force', stdout=StringIO())
+        self.business.refresh_from_db()
+        name = self.business.file_variants['web']
+        self.assertNotEqual(name, old_name)
+        self.assertTrue(os.path.exists(os.path.join(MEDIA_ROOT, name)))
+        self.assertFalse(os.path.exists(os.path.join(MEDIA_ROOT, old_name)))
@@ -64,6 +64,40 @@ class OfferDetailTests(APITestCase):
         self.assertEqual(data['id'], self.offer.pk)
         self.assertEqual(len(data['details']), 3)
 
+    def test_get_offer_expanded(self):
+        """
+        Ensure '?expand=' embeds tiers and creator profile.
+        """
+        self.client.force_authenticate(self.other)
+        url = offer_detail_url(self.offer.pk)
+        res = self.client.get(url, {'expand': 'details,user'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['details'][0]['title'], 'Basic Design')
+        self.assertEqual(res.data['user']['username'], 'owner')
+
+        etag = res['ETag']
+        self.owner.location = 'Berlin'
+        self.owner.save()
+        res = self.client.get(
+            url, {'expand': 'details,user'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['user']['location'], 'Berlin')
+
+    def test_get_offer_not_modified(self):
+        """
+        Ensure an unchanged offer gets HTTP 304 by its ETag.
+        """
+        self.client.force_authenticate(self.owner)
+        url = offer_detail_url(self.offer.pk)
+        etag = self.client.get(url)['ETag']
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(url, {'title': 'Updated'}, format='json')
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
     def test_get_offer_unauthenticated(self):
         """
         Ensure unauthenticated users cannot retrieve offer (HTTP 401).
@@ -105,6 +139,93 @@ class OfferDetailTests(APITestCase):
         updated = next(d for d in data['details']
                        if d['id'] == self.details[0].id)
         self.assertEqual(updated['title'], 'Basic Design Updated')
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 100)
+        self.assertEqual(self.offer.min_delivery_time, 6)
+
+    def test_patch_offer_details_in_bulk(self):
+        """
+        Ensure several tiers are updated with a fixed number of queries.
+        """
+        self.client.force_authenticate(self.owner)
+        url = offer_detail_url(self.offer.pk)
+        payload = {'details': [
+            {'offer_type': 'basic', 'price': 40},
+            {'offer_type': 'premium', 'price': 400, 'features': ['Z']},
+        ]}
+        with self.assertNumQueries(8):
+            res = self.client.patch(url, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        prices = {d['offer_type']: d['price'] for d in res.data['details']}
+        self.assertEqual(prices, {
+            'basic': 40, 'standard': 100, 'premium': 400
+        })
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 40)
+        premium = next(d for d in self.details if d.offer_type == 'premium')
+        self.assertEqual(
+            list(premium.feature_index.values_list('name', flat=True)),
+            ['z']
+        )
+
+    def test_patch_offer_unknown_offer_type(self):
+        """
+        Ensure an unknown tier rejects the whole update (HTTP 400).
+        """
+        self.client.force_authenticate(self.owner)
+        url = offer_detail_url(self.offer.pk)
+        payload = {'title': 'Changed', 'details': [
+            {'offer_type': 'basic', 'price': 40},
+            {'offer_type': 'unknown', 'price': 400},
+        ]}
+        res = self.client.patch(url, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.title, 'Grafikdesign-Paket')
+        self.assertEqual(self.offer.min_price, 50)
+
+    def test_patch_offer_repeated_offer_type(self):
+        """
+        Ensure a tier given twice rejects the whole update (HTTP 400).
+        """
+        self.client.force_authenticate(self.owner)
+        url = offer_detail_url(self.offer.pk)
+        payload = {'details': [
+            {'offer_type': 'basic', 'price': 40},
+            {'offer_type': 'basic', 'price': 400},
+        ]}
+        res = self.client.patch(url, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('details', res.data)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 50)
+
+    def test_patch_offer_repeated_offer_type_features(self):
+        """
+        Ensure features of a tier given twice are rejected (HTTP 400)
+        and leave its feature index unchanged.
+        """
+        self.client.force_authenticate(self.owner)
+        basic = next(d for d in self.details if d.offer_type == 'basic')
+        indexed = set(basic.feature_index.values_list('name', flat=True))
+        payload = {'details': [
+            {'offer_type': 'basic', 'features': ['X']},
+            {'offer_type': 'basic', 'features': ['Y']},
+        ]}
+        res = self.client.patch(
+            offer_detail_url(self.offer.pk), payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            set(basic.feature_index.values_list('name', flat=True)), indexed)
+
+    def test_delete_offer_detail_updates_stats(self):
+        """
+        Ensure deleting an offer detail updates the offer stats.
+        """
+        self.details[0].delete()
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 100)
+        self.assertEqual(self.offer.max_delivery_time, 15)
 
     def test_patch_offer_unauthenticated(self):
         """
@@ -58,6 +58,16 @@ class OfferDetailRetrieveTests(APITestCase):
         self.assertEqual(data['features'], ['Logo Design', 'Visitenkarte'])
         self.assertEqual(data['offer_type'], 'basic')
 
+    def test_get_offerdetail_not_modified(self):
+        """
+        Ensure an unchanged offer detail gets HTTP 304 by Last-Modified.
+        """
+        self.client.force_authenticate(self.user)
+        url = detail_url(self.detail.id)
+        last_modified = self.client.get(url)['Last-Modified']
+        res = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
     def test_get_offerdetail_unauthenticated(self):
         """
         Ensure unauthenticated users cannot retrieve offer detail (HTTP 401).
@@ -74,3 +84,37 @@ class OfferDetailRetrieveTests(APITestCase):
         url = detail_url(9999)
         res = self.client.get(url)
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_offerdetails_by_ids(self):
+        """
+        Ensure many offer details are retrieved in one query, in order.
+        """
+        other = OfferDetail.objects.create(
+            offer=self.offer, title='Premium', price=300,
+            delivery_time_in_days=2, offer_type='premium'
+        )
+        self.client.force_authenticate(self.user)
+        ids = f'{other.id},{self.detail.id},9999,{other.id}'
+        with self.assertNumQueries(1):
+            res = self.client.get('/api/offerdetails/', {'ids': ids})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [d['id'] for d in res.data], [other.id, self.detail.id])
+        self.assertEqual(res.data[1]['title'], 'Basic Design')
+
+    def test_get_offerdetails_by_invalid_ids(self):
+        """
+        Ensure missing, invalid or too many ids get HTTP 400.
+        """
+        self.client.force_authenticate(self.user)
+        too_many = ','.join(str(pk) for pk in range(1, 102))
+        for ids in ['', 'a,1', '0', too_many]:
+            res = self.client.get('/api/offerdetails/', {'ids': ids})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_offerdetails_unauthenticated(self):
+        """
+        Ensure unauthenticated users cannot retrieve offer details.
+        """
+        res = self.client.get('/api/offerdetails/', {'ids': self.detail.id})
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
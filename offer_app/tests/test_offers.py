@@ -1,5 +1,9 @@
+# Standard libraries
+import json
+
 # Third-party suppliers
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
@@ -57,6 +61,7 @@ class OfferListCreateTests(APITestCase):
                 delivery_time_in_days=3, price=200,
                 features=['C'], offer_type='premium'),
         ])
+        self.offer.update_stats()
 
     def test_get_offers_list(self):
         """
@@ -70,6 +75,40 @@ class OfferListCreateTests(APITestCase):
         self.assertEqual(offer_data['min_price'], 100)
         self.assertEqual(offer_data['max_delivery_time'], 7)
 
+    def test_get_offers_expanded(self):
+        """
+        Ensure '?expand=' embeds tiers and creator without extra queries.
+        """
+        with self.assertNumQueries(3):
+            res = self.client.get(
+                offers_list_url(), {'expand': 'details,user,unknown'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        offer_data = res.data['results'][0]
+        self.assertEqual(
+            [d['price'] for d in offer_data['details']], [100, 150, 200])
+        self.assertEqual(offer_data['user']['user'], self.business.id)
+        self.assertEqual(offer_data['user']['username'], 'bizuser')
+
+    def test_get_offers_expanded_anonymous(self):
+        """
+        Ensure anonymous users get the public part of creator profiles
+        only, also when a full profile is cached.
+        """
+        self.business.tel = '0123 456789'
+        self.business.save()
+        self.client.force_authenticate(self.customer)
+        res = self.client.get(offers_list_url(), {'expand': 'user'})
+        self.assertEqual(res.data['results'][0]['user']['tel'], '0123 456789')
+
+        self.client.force_authenticate(None)
+        res = self.client.get(offers_list_url(), {'expand': 'user'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertIn('Authorization', res['Vary'])
+        self.assertEqual(set(res.data['results'][0]['user']), {
+            'user', 'username', 'first_name', 'last_name', 'file_variants'
+        })
+
     def test_post_offer_unauthenticated(self):
         """
         Ensure unauthenticated users cannot create an offer (HTTP 401).
@@ -136,3 +175,549 @@ class OfferListCreateTests(APITestCase):
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         self.assertEqual(res.data['title'], 'Grafikdesign-Paket')
         self.assertEqual(len(res.data['details']), 3)
+        offer = Offer.objects.get(pk=res.data['id'])
+        self.assertEqual(offer.min_price, 100)
+        self.assertEqual(offer.min_delivery_time, 5)
+        self.assertEqual(offer.max_delivery_time, 10)
+
+    def get_offer_payload(self, title, price=100):
+        """
+        Get an offer payload with 3 details.
+        """
+        return {
+            'title': title,
+            'description': 'Desc',
+            'details': [
+                {
+                    'title': offer_type, 'revisions': 1,
+                    'delivery_time_in_days': idx, 'price': price * idx,
+                    'features': ['Logo'], 'offer_type': offer_type
+                }
+                for idx, offer_type in enumerate(
+                    ['basic', 'standard', 'premium'], 1)
+            ]
+        }
+
+    def test_post_offer_batch_success(self):
+        """
+        Ensure a batch of offers is created with bulk inserts (HTTP 201).
+        """
+        self.client.force_authenticate(self.business)
+        payload = [
+            self.get_offer_payload('Batch A'),
+            self.get_offer_payload('Batch B', price=50),
+        ]
+        with self.assertNumQueries(6):
+            res = self.client.post(offers_list_url(), payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([o['title'] for o in res.data], ['Batch A', 'Batch B'])
+        self.assertEqual(len(res.data[1]['details']), 3)
+        offer = Offer.objects.get(title='Batch B')
+        self.assertEqual(offer.min_price, 50)
+        self.assertEqual(offer.max_delivery_time, 3)
+        self.assertEqual(offer.feature_index.filter(name='logo').count(), 3)
+
+    def test_post_offer_batch_reports_errors_per_item(self):
+        """
+        Ensure an invalid batch item rejects the whole batch (HTTP 400).
+        """
+        self.client.force_authenticate(self.business)
+        invalid = self.get_offer_payload('Invalid')
+        invalid['details'] = invalid['details'][:1]
+        payload = [self.get_offer_payload('Valid'), invalid]
+        res = self.client.post(offers_list_url(), payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('details', res.data[1])
+        self.assertFalse(Offer.objects.filter(title='Valid').exists())
+
+    def test_get_offers_sparse_fields(self):
+        """
+        Ensure '?fields=' skips the queries of left out fields.
+        """
+        with self.assertNumQueries(2):
+            res = self.client.get(
+                offers_list_url(), {'fields': 'id,title,min_price'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'][0], {
+            'id': self.offer.id, 'title': 'Website Design', 'min_price': 100
+        })
+
+    def test_get_offers_omit_fields(self):
+        """
+        Ensure '?omit=' leaves fields out of the offer list.
+        """
+        res = self.client.get(
+            offers_list_url(), {'omit': 'details,description'})
+        offer_data = res.data['results'][0]
+        self.assertNotIn('details', offer_data)
+        self.assertNotIn('description', offer_data)
+        self.assertEqual(offer_data['user_details']['username'], 'bizuser')
+
+    def test_export_offers_ndjson(self):
+        """
+        Ensure all offers are streamed as NDJSON without pagination.
+        """
+        Offer.objects.create(user=self.business, title='Second')
+        res = self.client.get(offers_list_url(), {'format': 'ndjson'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([r['title'] for r in rows], [
+            'Second', 'Website Design'
+        ])
+        self.assertEqual(len(rows[1]['details']), 3)
+
+    def test_get_offers_filtered_by_stats(self):
+        """
+        Ensure offers are filtered by stored price and delivery time stats.
+        """
+        url = offers_list_url()
+        res = self.client.get(url, {'min_price': 150}, format='json')
+        self.assertEqual(res.data['count'], 0)
+        res = self.client.get(url, {'max_delivery_time': 7}, format='json')
+        self.assertEqual(res.data['count'], 1)
+
+
+class OfferCursorPaginationTests(APITestCase):
+    """
+    Tests for listing offers by keyset (cursor) pagination.
+    """
+
+    def setUp(self):
+        """
+        Set up a business user with offers of different prices.
+        """
+        self.business = User.objects.create_user(
+            username='bizuser', password='pass', type='business'
+        )
+        self.offers = []
+        for price in [300, 100, 200, 100, 400]:
+            offer = Offer.objects.create(
+                user=self.business, title=f'Offer {price}',
+                description='Desc', min_price=price
+            )
+            self.offers.append(offer)
+        Offer.objects.create(user=self.business, title='No details')
+
+    def collect_ids(self, params):
+        """
+        Get ids of all pages by following the next links.
+        """
+        ids, url, pages = [], offers_list_url(), []
+        res = self.client.get(url, params, format='json')
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', res.data)
+            pages.append(res.data)
+            ids += [o['id'] for o in res.data['results']]
+            if not res.data['next']:
+                return ids, pages
+            res = self.client.get(res.data['next'], format='json')
+
+    def test_cursor_pages_by_updated_at(self):
+        """
+        Ensure cursor pages follow the default ordering without gaps.
+        """
+        ids, pages = self.collect_ids({'paginate': 'cursor', 'page_size': 2})
+        expected = list(
+            Offer.objects.order_by('-updated_at', '-id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]['previous'])
+
+    def test_cursor_pages_by_min_price(self):
+        """
+        Ensure cursor pages by min_price keep ties and empty prices.
+        """
+        ids, pages = self.collect_ids({
+            'paginate': 'cursor', 'page_size': 2, 'ordering': 'min_price'
+        })
+        prices = [Offer.objects.get(pk=pk).min_price for pk in ids]
+        self.assertEqual(prices, [100, 100, 200, 300, 400, None])
+
+        res = self.client.get(pages[-1]['previous'], format='json')
+        previous_ids = [o['id'] for o in res.data['results']]
+        self.assertEqual(previous_ids, ids[2:4])
+
+    def test_invalid_cursor(self):
+        """
+        Ensure an invalid cursor gets HTTP 404.
+        """
+        res = self.client.get(offers_list_url(), {'cursor': 'invalid'})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class OfferSearchTests(APITestCase):
+    """
+    Tests for searching offers by title and description.
+    """
+
+    def setUp(self):
+        """
+        Set up a business user with offers to search.
+        """
+        self.business = User.objects.create_user(
+            username='bizuser', password='pass', type='business'
+        )
+        self.logo = Offer.objects.create(
+            user=self.business, title='Logo Design',
+            description='Vector graphics for your brand'
+        )
+        self.web = Offer.objects.create(
+            user=self.business, title='Website',
+            description='Responsive design with a custom logo'
+        )
+
+    def search_ids(self, term, **params):
+        """
+        Get ids of offers found by a search term.
+        """
+        res = self.client.get(
+            offers_list_url(), {'search': term, **params}, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [o['id'] for o in res.data['results']]
+
+    def test_search_ranks_title_matches_first(self):
+        """
+        Ensure offers are ranked by relevance with title hits first.
+        """
+        self.assertEqual(self.search_ids('logo'), [self.logo.id, self.web.id])
+
+    def test_search_matches_prefixes_of_all_terms(self):
+        """
+        Ensure every term must match, each as a prefix.
+        """
+        self.assertEqual(self.search_ids('resp des'), [self.web.id])
+        self.assertEqual(self.search_ids('vect website'), [])
+
+    def test_search_index_follows_writes(self):
+        """
+        Ensure the search index follows updated and deleted offers.
+        """
+        self.web.title = 'Online Shop'
+        self.web.save()
+        self.logo.delete()
+        self.assertEqual(self.search_ids('shop'), [self.web.id])
+        self.assertEqual(self.search_ids('logo'), [self.web.id])
+
+    def test_search_keeps_requested_ordering(self):
+        """
+        Ensure an explicit ordering replaces the relevance ranking.
+        """
+        ids = self.search_ids('logo', ordering='updated_at')
+        self.assertEqual(ids, [self.logo.id, self.web.id])
+        ids = self.search_ids('logo', ordering='-updated_at')
+        self.assertEqual(ids, [self.web.id, self.logo.id])
+
+
+class OfferFeatureFilterTests(APITestCase):
+    """
+    Tests for filtering offers by the features of their details.
+    """
+
+    def setUp(self):
+        """
+        Set up offers whose details have different features.
+        """
+        self.business = User.objects.create_user(
+            username='bizuser', password='pass', type='business'
+        )
+        self.logo = self.create_offer('Logo', [['Logo', 'Vector'], ['Print']])
+        self.web = self.create_offer('Web', [['logo', '  Responsive ']])
+        self.plain = self.create_offer('Plain', [[]])
+
+    def create_offer(self, title, features):
+        """
+        Create an offer with one detail per list of features.
+        """
+        offer = Offer.objects.create(user=self.business, title=title)
+        for idx, names in enumerate(features):
+            OfferDetail.objects.create(
+                offer=offer, title=title, price=100,
+                delivery_time_in_days=5, features=names,
+                offer_type=f'type{idx}'
+            )
+        return offer
+
+    def filter_ids(self, **params):
+        """
+        Get ids of offers matching the given params.
+        """
+        res = self.client.get(offers_list_url(), params, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return sorted(o['id'] for o in res.data['results'])
+
+    def test_filter_by_all_features(self):
+        """
+        Ensure '?feature=' requires all features, in any detail.
+        """
+        self.assertEqual(
+            self.filter_ids(feature='LOGO'), [self.logo.id, self.web.id])
+        self.assertEqual(
+            self.filter_ids(feature='logo,print'), [self.logo.id])
+        self.assertEqual(self.filter_ids(feature='vector,responsive'), [])
+
+    def test_filter_by_any_feature(self):
+        """
+        Ensure '?feature_any=' requires one of the features.
+        """
+        self.assertEqual(
+            self.filter_ids(feature_any='print,responsive'),
+            [self.logo.id, self.web.id]
+        )
+
+    def test_index_follows_detail_updates(self):
+        """
+        Ensure the index follows changed and deleted details.
+        """
+        detail = self.web.details.get()
+        detail.features = ['Print']
+        detail.save()
+        self.assertEqual(
+            self.filter_ids(feature='print'), [self.logo.id, self.web.id])
+        self.logo.delete()
+        self.assertEqual(self.filter_ids(feature='print'), [self.web.id])
+        self.assertEqual(self.filter_ids(feature='logo'), [])
+
+
+class OfferFacetsTests(APITestCase):
+    """
+    Tests for counting offers by price, delivery time and creator.
+    """
+
+    def setUp(self):
+        """
+        Set up two business users with offers of different stats.
+        """
+        self.alice = User.objects.create_user(
+            username='alice', password='pass', type='business'
+        )
+        self.bob = User.objects.create_user(
+            username='bob', password='pass', type='business'
+        )
+        for user, title, price, days in [
+            (self.alice, 'Logo Design', 40, 3),
+            (self.alice, 'Logo Animation', 120, 7),
+            (self.alice, 'Website', 260, 20),
+            (self.bob, 'Logo Print', 1200, 45),
+        ]:
+            Offer.objects.create(
+                user=user, title=title, description='Desc',
+                min_price=price, max_delivery_time=days
+            )
+
+    def get_facets(self, **params):
+        """
+        Get facets of the offers matching the given params.
+        """
+        res = self.client.get('/api/offers/facets/', params, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_get_facets(self):
+        """
+        Ensure buckets, creators and histogram count all offers.
+        """
+        with self.assertNumQueries(3):
+            data = self.get_facets(bin_width=100)
+        self.assertEqual(data['count'], 4)
+        self.assertEqual(
+            [b['count'] for b in data['min_price']], [1, 0, 1, 1, 0, 1])
+        self.assertEqual(data['min_price'][0], {
+            'from': None, 'to': 50, 'count': 1
+        })
+        self.assertEqual(
+            [b['count'] for b in data['max_delivery_time']], [1, 1, 0, 1, 1])
+        self.assertEqual(data['creator'], [
+            {'user': self.alice.id, 'username': 'alice', 'count': 3},
+            {'user': self.bob.id, 'username': 'bob', 'count': 1},
+        ])
+        self.assertEqual(data['price_histogram']['bins'], [
+            {'from': 0, 'to': 100, 'count': 1},
+            {'from': 100, 'to': 200, 'count': 1},
+            {'from': 200, 'to': 300, 'count': 1},
+            {'from': 1200, 'to': 1300, 'count': 1},
+        ])
+
+    def test_get_facets_filtered(self):
+        """
+        Ensure facets follow the offer filters and the search.
+        """
+        data = self.get_facets(search='logo', max_delivery_time=7)
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['creator'], [
+            {'user': self.alice.id, 'username': 'alice', 'count': 2},
+        ])
+        data = self.get_facets(creator_id=self.bob.id)
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['price_histogram'], {
+            'bin_width': 50,
+            'bins': [{'from': 1200, 'to': 1250, 'count': 1}],
+        })
+
+    def test_get_facets_invalid_bin_width(self):
+        """
+        Ensure an invalid bin width gets HTTP 400.
+        """
+        res = self.client.get('/api/offers/facets/', {'bin_width': 0})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('bin_width', res.data)
+
+
+class OfferChangeFeedTests(APITestCase):
+    """
+    Tests for syncing changed and deleted offers.
+    """
+
+    def setUp(self):
+        """
+        Set up a business user with offers to sync.
+        """
+        self.business = User.objects.create_user(
+            username='bizuser', password='pass', type='business'
+        )
+        self.offers = [
+            Offer.objects.create(user=self.business, title=f'Offer {idx}')
+            for idx in range(3)
+        ]
+        OfferDetail.objects.create(
+            offer=self.offers[0], title='Basic', price=100,
+            delivery_time_in_days=5, offer_type='basic'
+        )
+
+    def get_changes(self, params):
+        """
+        Get a page of the change feed.
+        """
+        res = self.client.get('/api/offers/changes/', params, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_sync_pages_and_follows_changes(self):
+        """
+        Ensure a sync pages through offers and then only gets changes.
+        """
+        first = self.get_changes({'page_size': 2})
+        self.assertTrue(first['has_more'])
+        second = self.get_changes({'cursor': first['cursor'], 'page_size': 2})
+        self.assertFalse(second['has_more'])
+        ids = [o['id'] for o in first['results'] + second['results']]
+        self.assertEqual(
+            ids, [self.offers[1].id, self.offers[2].id, self.offers[0].id])
+        self.assertEqual(second['results'][-1]['details'][0]['price'], 100)
+
+        empty = self.get_changes({'cursor': second['cursor']})
+        self.assertEqual(empty['results'], [])
+        self.assertEqual(empty['deleted'], [])
+
+        self.offers[1].details.create(
+            title='Basic', price=50, delivery_time_in_days=2,
+            offer_type='basic'
+        )
+        deleted_id = self.offers[2].id
+        self.offers[2].delete()
+        with self.assertNumQueries(3):
+            changes = self.get_changes({'cursor': empty['cursor']})
+        self.assertEqual(
+            [o['id'] for o in changes['results']], [self.offers[1].id])
+        self.assertEqual([d['id'] for d in changes['deleted']], [deleted_id])
+
+    def test_changes_since_timestamp(self):
+        """
+        Ensure '?changed_since=' skips offers updated before.
+        """
+        self.offers[0].title = 'Changed'
+        self.offers[0].save()
+        data = self.get_changes({
+            'changed_since': self.offers[2].updated_at.isoformat()
+        })
+        self.assertEqual(
+            [o['id'] for o in data['results']], [self.offers[0].id])
+        self.assertIn('cursor=', data['next'])
+        self.assertNotIn('changed_since', data['next'])
+
+    def test_invalid_params(self):
+        """
+        Ensure an invalid timestamp or cursor gets HTTP 400.
+        """
+        for params in [{'changed_since': 'yesterday'}, {'cursor': 'x'}]:
+            res = self.client.get('/api/offers/changes/', params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OfferListCacheTests(APITestCase):
+    """
+    Tests for caching offer list responses.
+    """
+
+    def setUp(self):
+        """
+        Set up an empty cache and a sample offer.
+        """
+        cache.clear()
+        self.business = User.objects.create_user(
+            username='bizuser', password='pass', type='business'
+        )
+        self.admin = User.objects.create_user(
+            username='admin', password='pass', is_staff=True
+        )
+        self.offer = Offer.objects.create(
+            user=self.business, title='Logo Design', description='Desc'
+        )
+
+    def test_cached_response_is_served(self):
+        """
+        Ensure a repeated request is served from the cache.
+        """
+        first = self.client.get(offers_list_url(), {'page': 1})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get(offers_list_url(), {'page': '1'})
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+
+    def test_offer_write_invalidates_cache(self):
+        """
+        Ensure an offer write invalidates cached responses.
+        """
+        self.client.get(offers_list_url())
+        self.offer.title = 'Website'
+        self.offer.save()
+        res = self.client.get(offers_list_url())
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'][0]['title'], 'Website')
+
+    def test_get_offers_not_modified(self):
+        """
+        Ensure an unchanged offer list gets HTTP 304 by its ETag.
+        """
+        etag = self.client.get(offers_list_url())['ETag']
+        res = self.client.get(offers_list_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.offer.save()
+        res = self.client.get(offers_list_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_get_cache_stats(self):
+        """
+        Ensure admins can retrieve hit and miss counters (HTTP 200).
+        """
+        self.client.get(offers_list_url())
+        self.client.get(offers_list_url())
+        self.client.force_authenticate(self.admin)
+        res = self.client.get(offers_list_url() + 'cache-stats/')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['hits'], 1)
+        self.assertEqual(res.data['misses'], 1)
+
+    def test_get_cache_stats_forbidden(self):
+        """
+        Ensure non-admin users cannot retrieve cache stats (HTTP 403).
+        """
+        self.client.force_authenticate(self.business)
+        res = self.client.get(offers_list_url() + 'cache-stats/')
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
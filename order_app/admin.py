@@ -2,7 +2,13 @@
 from django.contrib import admin
 
 # Local imports
-from .models import Order
+from .models import (
+    ArchivedOrder, IdempotencyKey, Order, OrderCounter, OrderDailyRollup
+)
 
 
 admin.site.register(Order)
+admin.site.register(OrderCounter)
+admin.site.register(OrderDailyRollup)
+admin.site.register(IdempotencyKey)
+admin.site.register(ArchivedOrder)
@@ -0,0 +1,20 @@
+# Third-party suppliers
+from django_filters import rest_framework as filters
+
+# Local imports
+from order_app.models import Order
+
+
+class OrderFilter(filters.FilterSet):
+    """
+    Filter orders by status or creation time.
+    """
+    status = filters.ChoiceFilter(choices=Order.STATUS_CHOICES)
+    created_after = filters.IsoDateTimeFilter(
+        field_name='created_at', lookup_expr='gte')
+    created_before = filters.IsoDateTimeFilter(
+        field_name='created_at', lookup_expr='lt')
+
+    class Meta:
+        model = Order
+        fields = ['status', 'created_after', 'created_before']
@@ -0,0 +1,36 @@
+# Local imports
+from core.api.paginations import KeysetPagination
+
+
+class OrderCursorPagination(KeysetPagination):
+    """
+    Controls keyset pages of orders, requested by '?paginate=cursor'.
+    """
+    ordering = '-created_at'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Get the page of orders, merged with the archived orders of the
+        view if they are requested.
+        """
+        self.archived = getattr(view, 'archived_orders', None)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_rows(self, queryset, reverse):
+        """
+        Get the rows of the page and one more from the orders and, if
+        requested, the archived orders, each read by the cursor.
+        """
+        rows = super().get_rows(queryset, reverse)
+        if self.archived is None:
+            return rows
+        rows += super().get_rows(self.archived, reverse)
+        descending = self.ordering[0].startswith('-') != reverse
+        rows.sort(
+            key=lambda row: (getattr(row, self.field.attname), row.pk),
+            reverse=descending
+        )
+        return rows[:self.page_size + 1]
@@ -30,3 +30,19 @@ class IsAdminDelete(BasePermission):
             return True
         user = request.user
         return bool(user and user.is_staff)
+
+
+class IsOwnerOrStaff(BasePermission):
+    """
+    Allow reading data of a business user for the user itself and admin
+    users (staff) only.
+    """
+
+    def has_permission(self, request, view):
+        """
+        Check user for being the requested business user or admin.
+        """
+        user = request.user
+        return bool(user and user.is_authenticated and (
+            user.is_staff or user.pk == view.kwargs.get('business_user_id')
+        ))
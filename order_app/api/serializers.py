@@ -3,7 +3,7 @@ from rest_framework import serializers
 
 # Local imports
 from offer_app.models import OfferDetail
-from order_app.models import Order
+from order_app.models import Order, OrderCounter
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -38,6 +38,17 @@ class OrderCreateSerializer(serializers.Serializer):
         return value
 
 
+class BulkOrderStatusSerializer(serializers.Serializer):
+    """
+    Serializer for changing the status of many orders at once.
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False, max_length=100
+    )
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES)
+
+
 class OrderCountSerializer(serializers.Serializer):
     """
     Serializer for counting in-progress orders.
@@ -50,3 +61,30 @@ class CompletedOrderCountSerializer(serializers.Serializer):
     Serializer for counting completed orders.
     """
     completed_order_count = serializers.IntegerField()
+
+
+class OrderCountsSerializer(serializers.ModelSerializer):
+    """
+    Serializer for counting orders of all statuses.
+    """
+    class Meta:
+        model = OrderCounter
+        fields = ['business_user', 'in_progress', 'completed', 'cancelled']
+
+
+class BusinessOrderCountSerializer(serializers.Serializer):
+    """
+    Serializer for counting open and completed orders of a business user.
+    """
+    business_user = serializers.IntegerField()
+    order_count = serializers.IntegerField()
+    completed_order_count = serializers.IntegerField()
+
+
+class OrderRollupSerializer(serializers.Serializer):
+    """
+    Serializer for the amount and revenue of orders on a day.
+    """
+    day = serializers.DateField()
+    order_count = serializers.IntegerField()
+    revenue = serializers.IntegerField()
@@ -0,0 +1,312 @@
+# Standard libraries
+import hashlib
+import json
+from datetime import timedelta
+
+# Third-party suppliers
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.response import Response
+
+# Local imports
+from order_app.models import (
+    ArchivedOrder, IdempotencyKey, Order, OrderCounter, OrderDailyRollup,
+    archiving
+)
+from outbox_app.models import OutboxEvent
+
+
+class OrderIdempotency:
+    """
+    Service storing order responses by 'Idempotency-Key', so a retried
+    request gets the first response instead of creating a duplicate.
+    """
+    header = 'Idempotency-Key'
+    max_key_length = 255
+
+    @staticmethod
+    def get_fingerprint(data):
+        """
+        Get a hash of the request data, independent of the key order.
+        """
+        value = json.dumps(data, sort_keys=True, default=str)
+        return hashlib.sha256(value.encode()).hexdigest()
+
+    @staticmethod
+    def get(user, key):
+        """
+        Get the unexpired record of a key, if any.
+        """
+        return IdempotencyKey.objects.filter(
+            user=user, key=key, expires_at__gt=timezone.now()
+        ).first()
+
+    @staticmethod
+    def reserve(user, key, fingerprint):
+        """
+        Reserve a key for a request, replacing an expired record.
+
+        Raises IntegrityError if the key is reserved concurrently.
+        """
+        now = timezone.now()
+        ttl = timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        IdempotencyKey.objects.filter(
+            user=user, key=key, expires_at__lte=now).delete()
+        return IdempotencyKey.objects.create(
+            user=user, key=key, fingerprint=fingerprint, expires_at=now + ttl
+        )
+
+    @staticmethod
+    def store(record, response):
+        """
+        Store the response of a reserved key.
+        """
+        record.status_code = response.status_code
+        record.response_body = response.data
+        record.save(update_fields=['status_code', 'response_body'])
+
+    @classmethod
+    def get_replay_response(cls, record):
+        """
+        Get the stored response of a key.
+        """
+        return Response(
+            record.response_body, status=record.status_code,
+            headers={'Idempotent-Replayed': 'true'}
+        )
+
+
+class BulkOrderStatus:
+    """
+    Service changing the status of many orders of a business user with
+    one ownership query and one update.
+    """
+
+    @staticmethod
+    def get_results(orders, ids, user, status):
+        """
+        Get the result per requested id, given the loaded orders.
+        """
+        results = {}
+        for pk in ids:
+            order = orders.get(pk)
+            if order is None:
+                results[pk] = 'not_found'
+            elif order['business_user_id'] != user.pk:
+                results[pk] = 'forbidden'
+            elif order['status'] == status:
+                results[pk] = 'unchanged'
+            else:
+                results[pk] = 'updated'
+        return results
+
+    @classmethod
+    def update(cls, user, ids, status):
+        """
+        Change the status of the orders of a business user, moving
+        them between the status counters in the same transaction.
+        """
+        ids = list(dict.fromkeys(ids))
+        with transaction.atomic():
+            orders = {
+                order['pk']: order for order in
+                Order.objects.select_for_update().filter(pk__in=ids)
+                .values(
+                    'pk', 'business_user_id', 'customer_user_id', 'status',
+                    'price', 'created_at'
+                )
+            }
+            results = cls.get_results(orders, ids, user, status)
+            updated = [pk for pk in ids if results[pk] == 'updated']
+            if updated:
+                Order.objects.filter(pk__in=updated).update(
+                    status=status, updated_at=timezone.now())
+                cls.update_counters(user, orders, updated, status)
+                cls.update_rollups(user, orders, updated, status)
+                cls.record_events(orders, updated, status)
+        return [{'id': pk, 'result': results[pk]} for pk in ids]
+
+    @staticmethod
+    def update_rollups(user, orders, updated, status):
+        """
+        Move updated orders from their previous to the new daily
+        rollups, with one change per day and status.
+        """
+        changes = {}
+        for pk in updated:
+            order = orders[pk]
+            day = timezone.localtime(order['created_at']).date()
+            moves = [((day, order['status']), -1), ((day, status), 1)]
+            for key, sign in moves:
+                count, revenue = changes.get(key, (0, 0))
+                changes[key] = (count + sign, revenue + sign * order['price'])
+        for (day, old), (count, revenue) in changes.items():
+            OrderDailyRollup.add(user.pk, day, old, count, revenue)
+
+    @staticmethod
+    def record_events(orders, updated, status):
+        """
+        Record the outbox events of the updated orders with one insert.
+        """
+        OutboxEvent.objects.bulk_create([
+            Order(**{**orders[pk], 'status': status}).get_event(
+                'order.status_changed', orders[pk]['status'])
+            for pk in updated
+        ])
+
+    @staticmethod
+    def update_counters(user, orders, updated, status):
+        """
+        Move updated orders from their previous to the new counter.
+        """
+        previous = {}
+        for pk in updated:
+            old = orders[pk]['status']
+            previous[old] = previous.get(old, 0) + 1
+        for old, amount in previous.items():
+            OrderCounter.add(user.pk, old, -amount)
+        OrderCounter.add(user.pk, status, len(updated))
+
+
+class OrderArchive:
+    """
+    Service moving finished orders into the archive table, and telling
+    reads whether they reach into the archive.
+
+    Archived orders keep being counted by the order counters.
+    """
+    finished_statuses = ['completed', 'cancelled']
+    include_query_param = 'include_archived'
+    true_values = ['1', 'true', 'yes']
+
+    @staticmethod
+    def get_cutoff(days=None):
+        """
+        Get the time before which finished orders are archived.
+        """
+        if days is None:
+            days = settings.ORDER_ARCHIVE_AFTER_DAYS
+        return timezone.now() - timedelta(days=days)
+
+    @classmethod
+    def is_requested(cls, request):
+        """
+        Check the request for asking for archived orders, either by the
+        'include_archived' flag or by a creation time range reaching
+        back before the cutoff.
+        """
+        params = request.query_params
+        if params.get(cls.include_query_param, '').lower() in cls.true_values:
+            return True
+        if 'created_after' not in params and 'created_before' not in params:
+            return False
+        after = parse_datetime(params.get('created_after', ''))
+        if after is None:
+            return True
+        if timezone.is_naive(after):
+            after = timezone.make_aware(after)
+        return after < cls.get_cutoff()
+
+    @classmethod
+    def archive_batch(cls, cutoff, batch_size, after=0):
+        """
+        Move the next batch of finished orders, last changed before the
+        cutoff and following the given id, and get their ids.
+        """
+        with transaction.atomic():
+            orders = list(
+                Order.objects.select_for_update().filter(
+                    pk__gt=after, status__in=cls.finished_statuses,
+                    updated_at__lt=cutoff
+                ).order_by('pk')[:batch_size]
+            )
+            if not orders:
+                return []
+            pks = [order.pk for order in orders]
+            ArchivedOrder.objects.bulk_create(
+                [ArchivedOrder.from_order(order) for order in orders],
+                ignore_conflicts=True
+            )
+            token = archiving.set(True)
+            try:
+                Order.objects.filter(pk__in=pks).delete()
+            finally:
+                archiving.reset(token)
+        return pks
+
+
+class OrderRollups:
+    """
+    Service rebuilding the daily order rollups and reading time series
+    from them.
+    """
+
+    @staticmethod
+    def get_order_rows(model, start, end, business_user_id=None):
+        """
+        Get the amount and revenue of orders or archived orders per
+        business, day and status, created within the days.
+        """
+        queryset = model.objects.filter(
+            created_at__date__gte=start, created_at__date__lte=end)
+        if business_user_id is not None:
+            queryset = queryset.filter(business_user_id=business_user_id)
+        return (
+            queryset.order_by()
+            .values('business_user_id', 'status', day=TruncDate('created_at'))
+            .annotate(order_count=Count('pk'), revenue=Sum('price'))
+        )
+
+    @classmethod
+    def rebuild(cls, start, end, business_user_id=None):
+        """
+        Replace the rollups of the days by the orders and archived
+        orders created within them, and get the amount of rollups.
+        """
+        totals = {}
+        with transaction.atomic():
+            rollups = OrderDailyRollup.objects.filter(day__range=(start, end))
+            if business_user_id is not None:
+                rollups = rollups.filter(business_user_id=business_user_id)
+            rollups.delete()
+            for model in [Order, ArchivedOrder]:
+                for row in cls.get_order_rows(
+                    model, start, end, business_user_id
+                ):
+                    key = (row['business_user_id'], row['day'], row['status'])
+                    rollup = totals.setdefault(key, OrderDailyRollup(
+                        business_user_id=key[0], day=key[1], status=key[2]))
+                    rollup.order_count += row['order_count']
+                    rollup.revenue += row['revenue']
+            OrderDailyRollup.objects.bulk_create(totals.values())
+        return len(totals)
+
+    @staticmethod
+    def get_series(business_user_id, start, end, status=None):
+        """
+        Get the amount and revenue of the orders of a business user per
+        day, including days without orders.
+        """
+        rollups = OrderDailyRollup.objects.filter(
+            business_user_id=business_user_id, day__range=(start, end))
+        if status is not None:
+            rollups = rollups.filter(status=status)
+        days = {
+            row['day']: row for row in
+            rollups.order_by().values('day').annotate(
+                order_count=Sum('order_count'), revenue=Sum('revenue'))
+        }
+        series = []
+        for offset in range((end - start).days + 1):
+            day = start + timedelta(days=offset)
+            row = days.get(day, {})
+            series.append({
+                'day': day,
+                'order_count': row.get('order_count', 0),
+                'revenue': row.get('revenue', 0),
+            })
+        return series
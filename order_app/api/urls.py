@@ -2,9 +2,16 @@
 from django.urls import path
 
 # Local imports
-from order_app.api.views import OrderDetailAPIView, OrderListCreateAPIView
+from order_app.api.views import (
+    BulkOrderStatusAPIView, OrderDetailAPIView, OrderListCreateAPIView
+)
 
 urlpatterns = [
     path('', OrderListCreateAPIView.as_view(), name='order-list-create'),
+    path(
+        'bulk-status/',
+        BulkOrderStatusAPIView.as_view(),
+        name='order-bulk-status'
+    ),
     path('<int:pk>/', OrderDetailAPIView.as_view(), name='order-detail'),
 ]
@@ -1,6 +1,16 @@
+# Standard libraries
+import heapq
+from datetime import timedelta
+
 # Third-party suppliers
 from django.contrib.auth import get_user_model
-from rest_framework import status
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import serializers, status
 from rest_framework.generics import (
     GenericAPIView,
     RetrieveUpdateDestroyAPIView
@@ -10,49 +20,173 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 # Local imports
-from .permissions import IsAdminDelete, IsBusinessUser
+from core.api.mixins import SparseFieldsMixin, StreamingExportMixin
+from core.api.params import get_id_list, get_query_value
+from .filters import OrderFilter
+from .paginations import OrderCursorPagination
+from .permissions import IsAdminDelete, IsBusinessUser, IsOwnerOrStaff
+from .services import (
+    BulkOrderStatus, OrderArchive, OrderIdempotency, OrderRollups
+)
 from .serializers import (
+    BulkOrderStatusSerializer, BusinessOrderCountSerializer,
     CompletedOrderCountSerializer, OrderCountSerializer,
-    OrderCreateSerializer, OrderSerializer
+    OrderCountsSerializer, OrderCreateSerializer, OrderRollupSerializer,
+    OrderSerializer
 )
 from offer_app.models import OfferDetail
-from order_app.models import Order
+from order_app.models import ArchivedOrder, Order, OrderCounter
 
 User = get_user_model()
 
 
-class OrderListCreateAPIView(GenericAPIView):
+class OrderListCreateAPIView(
+    SparseFieldsMixin, StreamingExportMixin, GenericAPIView
+):
     """
     View for listing and creating orders.
     """
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = OrderFilter
+    export_filename = 'orders'
 
     def get_queryset(self):
         """
         Get queryset of orders created by customer user or business user.
         """
         user = self.request.user
-        return (
-            Order.objects.filter(customer_user=user)
-            | Order.objects.filter(business_user=user)
+        return Order.objects.filter(
+            Q(customer_user=user) | Q(business_user=user)
+        )
+
+    @property
+    def paginator(self):
+        """
+        Get the keyset paginator if requested, else none, so the plain
+        list stays the default response.
+        """
+        if not hasattr(self, '_paginator'):
+            self._paginator = (
+                OrderCursorPagination()
+                if OrderCursorPagination.is_requested(self.request)
+                else None
+            )
+        return self._paginator
+
+    def get_archived_queryset(self):
+        """
+        Get the filtered archived orders of the user if the request
+        reaches into the archive, else None.
+        """
+        if not OrderArchive.is_requested(self.request):
+            return None
+        user = self.request.user
+        archived = OrderFilter(
+            self.request.query_params,
+            queryset=ArchivedOrder.objects.filter(
+                Q(customer_user=user) | Q(business_user=user)),
+            request=self.request
+        ).qs
+        if self.is_sparse():
+            archived = self.narrow_queryset(archived)
+        return archived
+
+    def merge(self, orders, archived):
+        """
+        Get orders and archived orders, each newest first, merged into
+        one sequence, newest first.
+        """
+        return heapq.merge(
+            orders, archived,
+            key=lambda order: (order.created_at, order.pk), reverse=True
+        )
+
+    def get_export_objects(self, queryset):
+        """
+        Get the orders to export, merged with the requested archived
+        orders.
+        """
+        if self.archived_orders is None:
+            return super().get_export_objects(queryset)
+        ordering = ['-created_at', '-pk']
+        return self.merge(
+            super().get_export_objects(queryset.order_by(*ordering)),
+            super().get_export_objects(
+                self.archived_orders.order_by(*ordering))
         )
 
     def get(self, request):
         """
-        Get order list.
+        Get order list, paged if requested.
         """
-        orders = self.get_queryset()
+        orders = self.filter_queryset(self.get_queryset())
+        self.archived_orders = self.get_archived_queryset()
+        if self.is_export():
+            return self.get_export_response(orders)
+        page = self.paginate_queryset(orders)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        if self.archived_orders is not None:
+            orders = list(self.merge(
+                orders.order_by('-created_at', '-pk'),
+                self.archived_orders.order_by('-created_at', '-pk')
+            ))
         serializer = self.get_serializer(orders, many=True)
         return Response(serializer.data)
 
     def post(self, request):
         """
-        Add new order.
+        Add new order, once per 'Idempotency-Key' if given.
         """
         if request.user.type != 'customer':
             return Response(status=status.HTTP_403_FORBIDDEN)
+        key = request.headers.get(OrderIdempotency.header)
+        if key is None:
+            return self.create_order(request)
+        if not key or len(key) > OrderIdempotency.max_key_length:
+            return Response(
+                {'detail': 'Invalid Idempotency-Key header.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return self.create_order_once(request, key)
 
+    def create_order_once(self, request, key):
+        """
+        Create an order, or replay the stored response of the key.
+        """
+        fingerprint = OrderIdempotency.get_fingerprint(request.data)
+        stored = OrderIdempotency.get(request.user, key)
+        if stored is not None:
+            if stored.fingerprint != fingerprint:
+                return Response(
+                    {'detail': 'Idempotency-Key is used by another request.'},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                )
+            return OrderIdempotency.get_replay_response(stored)
+
+        try:
+            with transaction.atomic():
+                record = OrderIdempotency.reserve(
+                    request.user, key, fingerprint)
+                response = self.create_order(request)
+                if response.status_code == status.HTTP_201_CREATED:
+                    OrderIdempotency.store(record, response)
+                else:
+                    transaction.set_rollback(True)
+        except IntegrityError:
+            return Response(
+                {'detail': 'Request with this Idempotency-Key in progress.'},
+                status=status.HTTP_409_CONFLICT
+            )
+        return response
+
+    def create_order(self, request):
+        """
+        Create an order from the requested offer detail.
+        """
         serializer = OrderCreateSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -92,47 +226,178 @@ class OrderDetailAPIView(RetrieveUpdateDestroyAPIView):
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated, IsBusinessUser, IsAdminDelete]
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Get an order, falling back to the archive for archived orders.
+        """
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            archived = get_object_or_404(ArchivedOrder, pk=kwargs['pk'])
+            self.check_object_permissions(request, archived)
+            return Response(self.get_serializer(archived).data)
+
 
-class OpenOrderCountAPIView(APIView):
+class BulkOrderStatusAPIView(APIView):
     """
-    View for counting orders 'in progress'.
+    View for changing the status of many orders at once.
+    """
+    permission_classes = [IsAuthenticated, IsBusinessUser]
+
+    def patch(self, request):
+        """
+        Change the status of the given orders of the business user and
+        report the result per id.
+        """
+        serializer = BulkOrderStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        new_status = serializer.validated_data['status']
+        results = BulkOrderStatus.update(
+            request.user, serializer.validated_data['ids'], new_status)
+        return Response({'status': new_status, 'results': results})
+
+
+class OrderCounterMixin:
+    """
+    Mixin reading the order counter of a business user.
     """
     permission_classes = [IsAuthenticated]
 
+    def get_counter(self, business_user_id):
+        """
+        Get the order counter by primary key, falling back to empty
+        counts for business users without orders, or None.
+        """
+        try:
+            return OrderCounter.objects.get(pk=business_user_id)
+        except OrderCounter.DoesNotExist:
+            if User.objects.filter(
+                pk=business_user_id, type='business'
+            ).exists():
+                return OrderCounter(business_user_id=business_user_id)
+            return None
+
+
+class OpenOrderCountAPIView(OrderCounterMixin, APIView):
+    """
+    View for counting orders 'in progress'.
+    """
+
     def get(self, request, business_user_id):
         """
         Get amount of orders 'in progress'.
         """
-        try:
-            User.objects.get(pk=business_user_id, type='business')
-        except User.DoesNotExist:
+        counter = self.get_counter(business_user_id)
+        if counter is None:
             return Response(status=status.HTTP_404_NOT_FOUND)
-        count = Order.objects.filter(
-            business_user_id=business_user_id,
-            status='in_progress'
-        ).count()
-        serializer = OrderCountSerializer({'order_count': count})
+        serializer = OrderCountSerializer(
+            {'order_count': counter.in_progress})
         return Response(serializer.data)
 
 
-class CompletedOrderCountAPIView(APIView):
+class CompletedOrderCountAPIView(OrderCounterMixin, APIView):
     """
     View for counting 'completed' orders.
     """
-    permission_classes = [IsAuthenticated]
 
     def get(self, request, business_user_id):
         """
         Get amount of 'completed' orders.
         """
-        try:
-            User.objects.get(pk=business_user_id, type='business')
-        except User.DoesNotExist:
+        counter = self.get_counter(business_user_id)
+        if counter is None:
             return Response(status=status.HTTP_404_NOT_FOUND)
-        count = Order.objects.filter(
-            business_user_id=business_user_id,
-            status='completed'
-        ).count()
         serializer = CompletedOrderCountSerializer(
-            {'completed_order_count': count})
+            {'completed_order_count': counter.completed})
         return Response(serializer.data)
+
+
+class OrderCountsAPIView(OrderCounterMixin, APIView):
+    """
+    View for counting orders of all statuses.
+    """
+
+    def get(self, request, business_user_id):
+        """
+        Get amounts of orders per status.
+        """
+        counter = self.get_counter(business_user_id)
+        if counter is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response(OrderCountsSerializer(counter).data)
+
+
+class BatchOrderCountAPIView(APIView):
+    """
+    View for counting open and completed orders of many business users.
+    """
+    permission_classes = [IsAuthenticated]
+    ids_query_param = 'ids'
+    max_ids = 100
+
+    def get(self, request):
+        """
+        Get order amounts of the requested business users in order,
+        reading all counters with one joined query.
+        """
+        ids = get_id_list(request, self.ids_query_param, self.max_ids)
+        users = User.objects.filter(
+            pk__in=ids, type='business'
+        ).select_related('order_counter').in_bulk()
+        counts = []
+        for pk in ids:
+            if pk not in users:
+                continue
+            counter = getattr(users[pk], 'order_counter', None)
+            counts.append({
+                'business_user': pk,
+                'order_count': counter.in_progress if counter else 0,
+                'completed_order_count': counter.completed if counter else 0,
+            })
+        return Response(BusinessOrderCountSerializer(counts, many=True).data)
+
+
+class OrderRollupAPIView(APIView):
+    """
+    View for the daily amount and revenue of the orders of a business
+    user, read from the daily rollups.
+    """
+    permission_classes = [IsAuthenticated, IsOwnerOrStaff]
+    default_days = 30
+    max_days = 366
+
+    def get_range(self, request):
+        """
+        Get the first and last day of the requested range.
+        """
+        end = get_query_value(
+            request, 'end', serializers.DateField(),
+            timezone.localdate().isoformat()
+        )
+        start = get_query_value(
+            request, 'start', serializers.DateField(),
+            (end - timedelta(days=self.default_days - 1)).isoformat()
+        )
+        if start > end or (end - start).days >= self.max_days:
+            raise serializers.ValidationError({
+                'start': f'A range of 1 to {self.max_days} days is required.'
+            })
+        return start, end
+
+    def get(self, request, business_user_id):
+        """
+        Get amount and revenue of orders per day, optionally of one
+        status only.
+        """
+        if not User.objects.filter(
+            pk=business_user_id, type='business'
+        ).exists():
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        start, end = self.get_range(request)
+        order_status = get_query_value(
+            request, 'status',
+            serializers.ChoiceField(choices=Order.STATUS_CHOICES)
+        )
+        series = OrderRollups.get_series(
+            business_user_id, start, end, order_status)
+        return Response(OrderRollupSerializer(series, many=True).data)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class OrderAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'order_app'
+
+    def ready(self):
+        """
+        Connect order signal receivers.
+        """
+        from order_app import signals  # noqa: F401
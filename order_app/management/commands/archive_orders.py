@@ -0,0 +1,42 @@
+# Third-party suppliers
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Local imports
+from order_app.api.services import OrderArchive
+
+
+class Command(BaseCommand):
+    """
+    Move finished orders into the archive table in batches.
+    """
+    help = 'Archive completed and cancelled orders older than the given age.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+        """
+        parser.add_argument(
+            '--days', type=int, default=settings.ORDER_ARCHIVE_AFTER_DAYS,
+            help='Days since the last change until an order is archived.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of orders moved per transaction.'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Archive orders one batch per transaction, so an interrupted run
+        keeps the moved batches and the next run resumes from there.
+        """
+        cutoff = OrderArchive.get_cutoff(options['days'])
+        total, after = 0, 0
+        while True:
+            pks = OrderArchive.archive_batch(
+                cutoff, options['batch_size'], after)
+            if not pks:
+                break
+            total += len(pks)
+            after = pks[-1]
+        self.stdout.write(f'Archived {total} orders.')
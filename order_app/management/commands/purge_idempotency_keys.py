@@ -0,0 +1,37 @@
+# Third-party suppliers
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+# Local imports
+from order_app.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    """
+    Remove expired idempotency keys in batches.
+    """
+    help = 'Remove expired idempotency keys of order requests.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+        """
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of keys removed per query.'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Remove expired keys one batch at a time, so no delete holds
+        long locks.
+        """
+        expired = IdempotencyKey.objects.filter(expires_at__lte=timezone.now())
+        total = 0
+        while True:
+            pks = list(
+                expired.values_list('pk', flat=True)[:options['batch_size']])
+            if not pks:
+                break
+            total += IdempotencyKey.objects.filter(pk__in=pks).delete()[0]
+        self.stdout.write(f'Removed {total} expired idempotency keys.')
@@ -0,0 +1,68 @@
+# Standard libraries
+from datetime import date, timedelta
+
+# Third-party suppliers
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+# Local imports
+from order_app.api.services import OrderRollups
+from order_app.models import ArchivedOrder, Order
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the daily order rollups of a range of days.
+    """
+    help = 'Rebuild or backfill daily order rollups from the orders.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+        """
+        parser.add_argument(
+            '--start', type=date.fromisoformat,
+            help='First day (YYYY-MM-DD), by default the first order day.'
+        )
+        parser.add_argument(
+            '--end', type=date.fromisoformat,
+            help='Last day (YYYY-MM-DD), by default today.'
+        )
+        parser.add_argument(
+            '--business-user', type=int,
+            help='Rebuild the rollups of this business user only.'
+        )
+        parser.add_argument(
+            '--chunk-days', type=int, default=31,
+            help='Number of days rebuilt per transaction.'
+        )
+
+    def get_first_day(self):
+        """
+        Get the creation day of the oldest order, or today.
+        """
+        first = [
+            model.objects.aggregate(first=Min('created_at'))['first']
+            for model in [Order, ArchivedOrder]
+        ]
+        first = [value for value in first if value is not None]
+        if not first:
+            return timezone.localdate()
+        return timezone.localtime(min(first)).date()
+
+    def handle(self, *args, **options):
+        """
+        Rebuild the rollups one chunk of days per transaction.
+        """
+        start = options['start'] or self.get_first_day()
+        end = options['end'] or timezone.localdate()
+        if start > end:
+            raise CommandError('The start must not be after the end.')
+        total = 0
+        while start <= end:
+            last = min(start + timedelta(days=options['chunk_days'] - 1), end)
+            total += OrderRollups.rebuild(
+                start, last, options['business_user'])
+            start = last + timedelta(days=1)
+        self.stdout.write(f'Rebuilt {total} daily order rollups.')
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.4 on 2026-10-18 17:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_order_counters(apps, schema_editor):
+    """
+    Fill the order counters from the existing orders.
+    """
+    Order = apps.get_model('order_app', 'Order')
+    OrderCounter = apps.get_model('order_app', 'OrderCounter')
+    counters = {}
+    rows = (
+        Order.objects.order_by()
+        .values('business_user_id', 'status')
+        .annotate(count=Count('pk'))
+    )
+    for row in rows:
+        counter = counters.setdefault(
+            row['business_user_id'],
+            OrderCounter(business_user_id=row['business_user_id'])
+        )
+        setattr(counter, row['status'], row['count'])
+    OrderCounter.objects.bulk_create(counters.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0005_rename_updated_at_customuser_uploaded_at'),
+        ('order_app', '0004_order_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderCounter',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_counter', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='business')),
+                ('in_progress', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Order Counter',
+                'verbose_name_plural': 'Order Counters',
+            },
+        ),
+        migrations.RunPython(
+            populate_order_counters, migrations.RunPython.noop),
+    ]
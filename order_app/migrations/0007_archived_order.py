@@ -0,0 +1,39 @@
+# Generated by Django 5.1.4 on 2026-10-18 17:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order_app', '0006_idempotency_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(default='', max_length=255)),
+                ('revisions', models.IntegerField(default=-1)),
+                ('delivery_time_in_days', models.PositiveIntegerField(default=0)),
+                ('price', models.IntegerField(default=0)),
+                ('features', models.JSONField(default=list)),
+                ('offer_type', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], default='in_progress', max_length=50)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('business_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders_as_business', to=settings.AUTH_USER_MODEL, verbose_name='business')),
+                ('customer_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders_as_customer', to=settings.AUTH_USER_MODEL, verbose_name='customer')),
+            ],
+            options={
+                'verbose_name': 'Archived Order',
+                'verbose_name_plural': 'Archived Orders',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['business_user', 'status', 'created_at'], name='order_app_a_busines_9a6fea_idx'), models.Index(fields=['customer_user', 'created_at'], name='order_app_a_custome_415559_idx')],
+            },
+        ),
+    ]
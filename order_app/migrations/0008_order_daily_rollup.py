@@ -0,0 +1,58 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def populate_order_rollups(apps, schema_editor):
+    """
+    Fill the daily order rollups from the existing and archived orders.
+    """
+    OrderDailyRollup = apps.get_model('order_app', 'OrderDailyRollup')
+    rollups = {}
+    for name in ['Order', 'ArchivedOrder']:
+        rows = (
+            apps.get_model('order_app', name).objects.order_by()
+            .values('business_user_id', 'status', day=TruncDate('created_at'))
+            .annotate(order_count=Count('pk'), revenue=Sum('price'))
+        )
+        for row in rows:
+            key = (row['business_user_id'], row['day'], row['status'])
+            rollup = rollups.setdefault(key, OrderDailyRollup(
+                business_user_id=key[0], day=key[1], status=key[2]))
+            rollup.order_count += row['order_count']
+            rollup.revenue += row['revenue']
+    OrderDailyRollup.objects.bulk_create(rollups.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order_app', '0007_archived_order'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=50)),
+                ('order_count', models.IntegerField(default=0)),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('business_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_rollups', to=settings.AUTH_USER_MODEL, verbose_name='business')),
+            ],
+            options={
+                'verbose_name': 'Order Daily Rollup',
+                'verbose_name_plural': 'Order Daily Rollups',
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('business_user', 'day', 'status'), name='unique_order_daily_rollup')],
+            },
+        ),
+        migrations.RunPython(
+            populate_order_rollups, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,19 @@
 # Standard libraries
+from contextvars import ContextVar
 from datetime import timedelta
 
 # Third-party suppliers
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
 
 # Local imports
 from auth_app.models import CustomUser
+from outbox_app.models import OutboxEvent
+
+# Set while orders are moved into the archive, so their deletes keep
+# them counted and record no 'order.deleted' event.
+archiving = ContextVar('archiving', default=False)
 
 
 class Order(models.Model):
@@ -17,6 +25,7 @@ class Order(models.Model):
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled')
     )
+    STATE_FIELDS = ('business_user', 'status', 'created_at', 'price')
 
     customer_user = models.ForeignKey(
         CustomUser,
@@ -48,9 +57,336 @@ class Order(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Order'
         verbose_name_plural = 'Orders'
+        indexes = [
+            models.Index(fields=['business_user', 'status', 'created_at']),
+            models.Index(fields=['customer_user', 'created_at']),
+        ]
 
     def __str__(self):
         """
         Get a string representing an order.
         """
         return f"Order #{self.id}: {self.title} ({self.status})"
+
+    @classmethod
+    def get_stored(cls, pk):
+        """
+        Get the stored business, status, creation time and price of an
+        order, locked until the end of the current transaction, or None.
+        """
+        return cls.objects.select_for_update().only(
+            *cls.STATE_FIELDS).filter(pk=pk).first()
+
+    def get_saved(self, stored, update_fields=None):
+        """
+        Get the order state written by a save of the given fields over
+        the stored state.
+        """
+        if stored is None or update_fields is None:
+            return self
+        state = {}
+        for name in self.STATE_FIELDS:
+            attname = self._meta.get_field(name).attname
+            source = stored
+            if name in update_fields or attname in update_fields:
+                source = self
+            state[attname] = getattr(source, attname)
+        return Order(**state)
+
+    def get_counted(self):
+        """
+        Get the business and status the order is counted for.
+        """
+        return (self.business_user_id, self.status)
+
+    def get_rolled(self):
+        """
+        Get the business, day, status and price the order is rolled up
+        for.
+        """
+        day = timezone.localtime(self.created_at).date()
+        return (self.business_user_id, day, self.status, self.price)
+
+    def get_event(self, topic, previous_status=None):
+        """
+        Get an outbox event describing a change of the order.
+        """
+        payload = {
+            'customer_user': self.customer_user_id,
+            'business_user': self.business_user_id,
+            'status': self.status,
+            'price': self.price,
+        }
+        if previous_status is not None:
+            payload['previous_status'] = previous_status
+        return OutboxEvent.build(topic, self.pk, payload)
+
+    def save(self, *args, **kwargs):
+        """
+        Save an order, move it from its stored state, read under lock in
+        the same transaction, between the status counters and daily
+        rollups and record its outbox event.
+        """
+        adding = self._state.adding
+        with transaction.atomic():
+            stored = None if adding else Order.get_stored(self.pk)
+            super().save(*args, **kwargs)
+            saved = self.get_saved(stored, kwargs.get('update_fields'))
+            OrderCounter.move(
+                stored and stored.get_counted(), saved.get_counted())
+            OrderDailyRollup.move(
+                stored and stored.get_rolled(), saved.get_rolled())
+            if stored is None:
+                self.get_event('order.created').save()
+            elif stored.status != saved.status:
+                self.get_event('order.status_changed', stored.status).save()
+            else:
+                self.get_event('order.updated').save()
+
+
+class OrderCounter(models.Model):
+    """
+    Represents the order amounts per status of a business user.
+    """
+    business_user = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="order_counter",
+        verbose_name="business",
+    )
+    in_progress = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Order Counter'
+        verbose_name_plural = 'Order Counters'
+
+    def __str__(self):
+        """
+        Get a string representing an order counter.
+        """
+        return (
+            f"Orders of {self.business_user_id}: {self.in_progress} "
+            f"in progress, {self.completed} completed, "
+            f"{self.cancelled} cancelled"
+        )
+
+    @classmethod
+    def add(cls, business_user_id, status, amount):
+        """
+        Add an amount to the counter of a business and status, creating
+        the counter only for a positive amount, as a missing counter was
+        deleted with its business, e.g. by the cascade removing its
+        orders.
+        """
+        changes = {status: F(status) + amount}
+        if cls.objects.filter(pk=business_user_id).update(**changes):
+            return
+        if amount <= 0:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    business_user_id=business_user_id, **{status: amount})
+        except IntegrityError:
+            cls.objects.filter(pk=business_user_id).update(**changes)
+
+    @classmethod
+    def move(cls, previous, current):
+        """
+        Move an order from its previous to its current counter, each
+        given as (business_user_id, status) or None.
+        """
+        if previous == current:
+            return
+        if previous is not None:
+            cls.add(*previous, -1)
+        if current is not None:
+            cls.add(*current, 1)
+
+
+class OrderDailyRollup(models.Model):
+    """
+    Represents the amount and revenue of the orders of a business user
+    created on a day, per status.
+    """
+    business_user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="order_rollups",
+        verbose_name="business",
+    )
+    day = models.DateField()
+    status = models.CharField(max_length=50, choices=Order.STATUS_CHOICES)
+    order_count = models.IntegerField(default=0)
+    revenue = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['day']
+        verbose_name = 'Order Daily Rollup'
+        verbose_name_plural = 'Order Daily Rollups'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['business_user', 'day', 'status'],
+                name='unique_order_daily_rollup'
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Get a string representing an order rollup.
+        """
+        return (
+            f"Orders of {self.business_user_id} on {self.day} "
+            f"({self.status}): {self.order_count}, revenue {self.revenue}"
+        )
+
+    @classmethod
+    def add(cls, business_user_id, day, status, count, revenue):
+        """
+        Add an amount of orders and their revenue to the rollup of a
+        business, day and status, creating the rollup only for a
+        positive amount, as a missing rollup was deleted with its
+        business, e.g. by the cascade removing its orders.
+        """
+        rollups = cls.objects.filter(
+            business_user_id=business_user_id, day=day, status=status)
+        changes = {
+            'order_count': F('order_count') + count,
+            'revenue': F('revenue') + revenue,
+        }
+        if rollups.update(**changes):
+            return
+        if count <= 0:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    business_user_id=business_user_id, day=day,
+                    status=status, order_count=count, revenue=revenue
+                )
+        except IntegrityError:
+            rollups.update(**changes)
+
+    @classmethod
+    def move(cls, previous, current):
+        """
+        Move an order from its previous to its current rollup, each
+        given as (business_user_id, day, status, price) or None.
+        """
+        if previous == current:
+            return
+        if previous is not None:
+            cls.add(*previous[:3], -1, -previous[3])
+        if current is not None:
+            cls.add(*current[:3], 1, current[3])
+
+
+class IdempotencyKey(models.Model):
+    """
+    Represents an idempotency key of an order request, storing the
+    response to replay when the request is retried.
+    """
+    user = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name="idempotency_keys"
+    )
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = 'Idempotency Key'
+        verbose_name_plural = 'Idempotency Keys'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'key'], name='unique_user_idempotency_key'
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Get a string representing an idempotency key.
+        """
+        return f"{self.key} of {self.user_id}"
+
+
+class ArchivedOrder(models.Model):
+    """
+    Represents a finished order moved out of the order table, keeping
+    its id and the schema of an order.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    customer_user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="archived_orders_as_customer",
+        verbose_name="customer",
+    )
+    business_user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="archived_orders_as_business",
+        verbose_name="business",
+    )
+    title = models.CharField(max_length=255, blank=False, default='')
+    revisions = models.IntegerField(default=-1)
+    delivery_time_in_days = models.PositiveIntegerField(default=0)
+    price = models.IntegerField(default=0)
+    features = models.JSONField(default=list)
+    offer_type = models.CharField(max_length=50)
+    status = models.CharField(
+        max_length=50,
+        choices=Order.STATUS_CHOICES,
+        default='in_progress',
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Archived Order'
+        verbose_name_plural = 'Archived Orders'
+        indexes = [
+            models.Index(fields=['business_user', 'status', 'created_at']),
+            models.Index(fields=['customer_user', 'created_at']),
+        ]
+
+    def __str__(self):
+        """
+        Get a string representing an archived order.
+        """
+        return f"Archived order #{self.id}: {self.title} ({self.status})"
+
+    @classmethod
+    def from_order(cls, order):
+        """
+        Get an unsaved copy of an order for the archive.
+        """
+        return cls(**{
+            field.attname: getattr(order, field.attname)
+            for field in Order._meta.concrete_fields
+        })
+
+    def get_counted(self):
+        """
+        Get the business and status the archived order is counted for.
+        """
+        return Order.get_counted(self)
+
+    def get_rolled(self):
+        """
+        Get the business, day, status and price the archived order is
+        rolled up for.
+        """
+        return Order.get_rolled(self)
+
+    def get_event(self, topic):
+        """
+        Get an outbox event describing a change of the archived order.
+        """
+        return Order.get_event(self, topic)
@@ -0,0 +1,45 @@
+# Third-party suppliers
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+
+# Local imports
+from order_app.models import (
+    ArchivedOrder, Order, OrderCounter, OrderDailyRollup, archiving
+)
+
+
+@receiver(pre_delete, sender=Order)
+def lock_order_on_delete(sender, instance, **kwargs):
+    """
+    Remember the stored state of an order about to be deleted, read
+    under lock within the transaction of the delete.
+    """
+    if archiving.get():
+        return
+    instance._stored = Order.get_stored(instance.pk)
+
+
+@receiver(post_delete, sender=Order)
+def update_counter_on_delete(sender, instance, **kwargs):
+    """
+    Remove a deleted order from its counter and daily rollup and record
+    its outbox event, within the transaction of the delete, which also
+    covers cascades and queryset deletes, but not archival.
+    """
+    if archiving.get():
+        return
+    stored = getattr(instance, '_stored', None) or instance
+    OrderCounter.move(stored.get_counted(), None)
+    OrderDailyRollup.move(stored.get_rolled(), None)
+    instance.get_event('order.deleted').save()
+
+
+@receiver(post_delete, sender=ArchivedOrder)
+def update_counter_on_archived_delete(sender, instance, **kwargs):
+    """
+    Remove a deleted archived order, e.g. by a cascade from its users,
+    from its counter and daily rollup and record its outbox event.
+    """
+    OrderCounter.move(instance.get_counted(), None)
+    OrderDailyRollup.move(instance.get_rolled(), None)
+    instance.get_event('order.deleted').save()
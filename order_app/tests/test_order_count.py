@@ -6,7 +6,7 @@ from rest_framework.test import APITestCase
 # Local imports
 from auth_app.models import CustomUser
 from offer_app.models import Offer, OfferDetail
-from order_app.models import Order
+from order_app.models import Order, OrderCounter
 
 
 def get_order_count_url(business_id):
@@ -78,6 +78,132 @@ class OpenOrderCountTests(APITestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data['order_count'], 1)
 
+    def test_get_order_count_single_query(self):
+        """
+        Ensure the count is read from the counter by primary key.
+        """
+        self.client.force_authenticate(self.customer)
+        with self.assertNumQueries(1):
+            res = self.client.get(get_order_count_url(self.business.id))
+        self.assertEqual(res.data['order_count'], 1)
+
+    def test_counters_follow_order_writes(self):
+        """
+        Ensure counters follow created, updated and deleted orders.
+        """
+        order = Order.objects.filter(
+            business_user=self.business, status='in_progress').get()
+        order.status = 'cancelled'
+        order.save()
+        Order.objects.filter(status='completed').delete()
+        counter = OrderCounter.objects.get(pk=self.business.id)
+        self.assertEqual(
+            (counter.in_progress, counter.completed, counter.cancelled),
+            (0, 0, 1)
+        )
+        self.customer.delete()
+        counter.refresh_from_db()
+        self.assertEqual(counter.cancelled, 0)
+
+    def test_counters_follow_stale_order_writes(self):
+        """
+        Ensure counters follow the stored status when orders loaded
+        before a concurrent change are saved or deleted.
+        """
+        order = Order.objects.get(
+            business_user=self.business, status='in_progress')
+        first = Order.objects.get(pk=order.pk)
+        second = Order.objects.get(pk=order.pk)
+        first.status = 'completed'
+        first.save()
+        second.status = 'cancelled'
+        second.save()
+        order.delete()
+        counter = OrderCounter.objects.get(pk=self.business.id)
+        self.assertEqual(
+            (counter.in_progress, counter.completed, counter.cancelled),
+            (0, 1, 0)
+        )
+
+    def test_counters_follow_deferred_order_writes(self):
+        """
+        Ensure saving an order loaded without its status neither counts
+        it twice nor loses its stored status.
+        """
+        order = Order.objects.only('id', 'title').get(
+            business_user=self.business, status='in_progress')
+        order.title = 'Renamed'
+        order.save()
+        order = Order.objects.only('id').get(pk=order.pk)
+        order.status = 'completed'
+        order.save(update_fields=['status'])
+        counter = OrderCounter.objects.get(pk=self.business.id)
+        self.assertEqual(
+            (counter.in_progress, counter.completed, counter.cancelled),
+            (0, 2, 0)
+        )
+
+    def test_missing_counter_not_created_by_decrement(self):
+        """
+        Ensure removing an order from a missing counter, e.g. one just
+        deleted with its business, creates no negative counter.
+        """
+        OrderCounter.objects.filter(pk=self.business.id).delete()
+        OrderCounter.move((self.business.id, 'in_progress'), None)
+        self.assertFalse(
+            OrderCounter.objects.filter(pk=self.business.id).exists())
+        OrderCounter.move(None, (self.business.id, 'completed'))
+        counter = OrderCounter.objects.get(pk=self.business.id)
+        self.assertEqual(counter.completed, 1)
+
+    def test_get_order_counts(self):
+        """
+        Ensure the counts of all statuses are returned at once.
+        """
+        self.client.force_authenticate(self.customer)
+        res = self.client.get(reverse('order-counts', args=[self.business.id]))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {
+            'business_user': self.business.id,
+            'in_progress': 1, 'completed': 1, 'cancelled': 0
+        })
+        business = CustomUser.objects.create_user(
+            username='new', password='pass', type='business'
+        )
+        res = self.client.get(reverse('order-counts', args=[business.id]))
+        self.assertEqual(res.data['in_progress'], 0)
+        res = self.client.get(reverse('order-counts', args=[self.customer.id]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_order_counts_batch(self):
+        """
+        Ensure counts of many business users are read in one query.
+        """
+        self.client.force_authenticate(self.customer)
+        business = CustomUser.objects.create_user(
+            username='new', password='pass', type='business'
+        )
+        ids = [
+            self.other_business.id, self.business.id, business.id,
+            self.customer.id, 9999
+        ]
+        with self.assertNumQueries(1):
+            res = self.client.get(
+                reverse('order-counts-batch'),
+                {'ids': ','.join(map(str, ids))}
+            )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [
+            {'business_user': self.other_business.id,
+             'order_count': 1, 'completed_order_count': 0},
+            {'business_user': self.business.id,
+             'order_count': 1, 'completed_order_count': 1},
+            {'business_user': business.id,
+             'order_count': 0, 'completed_order_count': 0},
+        ])
+        res = self.client.get(reverse('order-counts-batch'), {'ids': 'x'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_get_order_count_unauthenticated(self):
         """
         Ensure unauthenticated request returns HTTP 401.
@@ -1,12 +1,17 @@
+# Standard libraries
+from datetime import timedelta
+
 # Third-party suppliers
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
 # Local imports
 from auth_app.models import CustomUser
 from offer_app.models import Offer, OfferDetail
-from order_app.models import Order
+from order_app.api.services import OrderArchive
+from order_app.models import ArchivedOrder, Order, OrderCounter
 
 
 def get_order_detail_url(pk):
@@ -90,6 +95,20 @@ class OrderDetailTests(APITestCase):
         res = self.client.get(get_order_detail_url(9999))
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_get_archived_order(self):
+        """
+        Ensure an archived order is still retrieved by its id.
+        """
+        self.order.status = 'completed'
+        self.order.save()
+        OrderArchive.archive_batch(timezone.now() + timedelta(seconds=1), 1)
+        self.assertTrue(
+            ArchivedOrder.objects.filter(pk=self.order.pk).exists())
+        self.client.force_authenticate(self.customer)
+        res = self.client.get(get_order_detail_url(self.order.id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['status'], 'completed')
+
     def test_patch_order_success(self):
         """
         Ensure business user can update order status (HTTP 200).
@@ -168,3 +187,53 @@ class OrderDetailTests(APITestCase):
         self.client.force_authenticate(self.admin)
         res = self.client.delete(get_order_detail_url(9999))
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_patch_order_status_in_bulk(self):
+        """
+        Ensure many orders are updated at once with per-id results.
+        """
+        orders = [self.order] + [
+            Order.objects.create(
+                customer_user=self.customer, business_user=self.business,
+                title='Order', offer_type='basic', status=order_status
+            )
+            for order_status in ['in_progress', 'completed']
+        ]
+        other = CustomUser.objects.create_user(
+            username='biz2', password='pass', type='business'
+        )
+        foreign = Order.objects.create(
+            customer_user=self.customer, business_user=other,
+            title='Foreign', offer_type='basic'
+        )
+        self.client.force_authenticate(self.business)
+        ids = [o.id for o in orders] + [foreign.id, 9999]
+        res = self.client.patch(
+            reverse('order-bulk-status'),
+            {'ids': ids, 'status': 'completed'}, format='json'
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [r['result'] for r in res.data['results']],
+            ['updated', 'updated', 'unchanged', 'forbidden', 'not_found']
+        )
+        self.assertEqual(
+            Order.objects.filter(
+                business_user=self.business, status='completed').count(),
+            3
+        )
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, 'in_progress')
+        counter = OrderCounter.objects.get(pk=self.business.id)
+        self.assertEqual((counter.in_progress, counter.completed), (0, 3))
+
+    def test_patch_order_status_in_bulk_forbidden(self):
+        """
+        Ensure customers cannot update orders in bulk (HTTP 403).
+        """
+        self.client.force_authenticate(self.customer)
+        res = self.client.patch(
+            reverse('order-bulk-status'),
+            {'ids': [self.order.id], 'status': 'completed'}, format='json'
+        )
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -1,12 +1,21 @@
+# Standard libraries
+from datetime import timedelta
+from io import StringIO
+
 # Third-party suppliers
+from django.core.management import call_command
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
 # Local imports
 from auth_app.models import CustomUser
 from offer_app.models import Offer, OfferDetail
-from order_app.models import Order
+from order_app.models import (
+    ArchivedOrder, IdempotencyKey, Order, OrderCounter, OrderDailyRollup
+)
+from outbox_app.models import OutboxEvent
 
 
 def get_order_list_url():
@@ -73,6 +82,190 @@ class OrderListCreateTests(APITestCase):
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]['id'], self.order.id)
 
+    def create_orders(self, statuses):
+        """
+        Create further orders of the customer with the given statuses.
+        """
+        return [
+            Order.objects.create(
+                customer_user=self.customer, business_user=self.business,
+                title=f'Order {idx}', offer_type='basic', status=status
+            )
+            for idx, status in enumerate(statuses)
+        ]
+
+    def test_get_orders_filtered(self):
+        """
+        Ensure orders are filtered by status and creation time.
+        """
+        orders = self.create_orders(['completed', 'completed', 'cancelled'])
+        self.client.force_authenticate(self.business)
+        res = self.client.get(get_order_list_url(), {'status': 'completed'})
+        self.assertEqual(
+            [o['id'] for o in res.data], [orders[1].id, orders[0].id])
+
+        res = self.client.get(get_order_list_url(), {
+            'created_after': orders[0].created_at.isoformat(),
+            'created_before': orders[2].created_at.isoformat(),
+        })
+        self.assertEqual(
+            [o['id'] for o in res.data], [orders[1].id, orders[0].id])
+
+        res = self.client.get(get_order_list_url(), {'status': 'unknown'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_orders_cursor_pages(self):
+        """
+        Ensure '?paginate=cursor' pages through orders, newest first.
+        """
+        orders = [self.order] + self.create_orders(['in_progress'] * 4)
+        self.client.force_authenticate(self.customer)
+        ids, params = [], {'paginate': 'cursor', 'page_size': 2}
+        res = self.client.get(get_order_list_url(), params)
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids += [o['id'] for o in res.data['results']]
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+        self.assertEqual(ids, [o.id for o in reversed(orders)])
+
+    def test_get_orders_sparse_fields(self):
+        """
+        Ensure '?fields=' returns only the requested order fields.
+        """
+        self.client.force_authenticate(self.customer)
+        res = self.client.get(
+            get_order_list_url(), {'fields': 'id,status,price'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [
+            {'id': self.order.id, 'price': 150, 'status': 'in_progress'}
+        ])
+
+    def test_export_orders_csv(self):
+        """
+        Ensure orders are streamed as CSV with a header line.
+        """
+        self.client.force_authenticate(self.customer)
+        res = self.client.get(
+            get_order_list_url(), {'format': 'csv', 'fields': 'id,features'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'text/csv; charset=utf-8')
+        content = b''.join(res.streaming_content).decode()
+        self.assertEqual(content.splitlines(), [
+            'id,features',
+            f'{self.order.id},"[""Logo Design"", ""Visitenkarten""]"',
+        ])
+
+    def archive_orders(self, statuses, days=400):
+        """
+        Create orders with the given statuses, last changed days ago,
+        and archive the finished ones.
+        """
+        orders = self.create_orders(statuses)
+        changed = timezone.now() - timedelta(days=days)
+        for idx, order in enumerate(orders):
+            Order.objects.filter(pk=order.pk).update(
+                created_at=changed - timedelta(days=idx), updated_at=changed)
+        call_command('archive_orders', '--batch-size', '1', stdout=StringIO())
+        return orders
+
+    def test_archive_finished_orders(self):
+        """
+        Ensure only old finished orders are moved, staying counted.
+        """
+        orders = self.archive_orders(['completed', 'cancelled', 'in_progress'])
+        self.assertEqual(
+            set(ArchivedOrder.objects.values_list('pk', flat=True)),
+            {orders[0].pk, orders[1].pk}
+        )
+        self.assertEqual(
+            set(Order.objects.values_list('pk', flat=True)),
+            {self.order.pk, orders[2].pk}
+        )
+        counter = OrderCounter.objects.get(pk=self.business.pk)
+        self.assertEqual((counter.completed, counter.cancelled), (1, 1))
+        self.assertFalse(
+            OutboxEvent.objects.filter(topic='order.deleted').exists())
+
+    def test_delete_archived_orders_with_user(self):
+        """
+        Ensure archived orders deleted with their customer leave their
+        counters and daily rollups.
+        """
+        orders = self.archive_orders(['completed', 'cancelled'])
+        call_command('rebuild_order_rollups', stdout=StringIO())
+        rollups = OrderDailyRollup.objects.filter(
+            business_user=self.business, order_count__gt=0)
+        self.assertEqual(rollups.count(), 3)
+        self.customer.delete()
+        counter = OrderCounter.objects.get(pk=self.business.pk)
+        self.assertEqual(
+            (counter.in_progress, counter.completed, counter.cancelled),
+            (0, 0, 0)
+        )
+        self.assertFalse(rollups.exists())
+        self.assertEqual(
+            set(OutboxEvent.objects.filter(topic='order.deleted')
+                .values_list('aggregate_id', flat=True)),
+            {self.order.pk, orders[0].pk, orders[1].pk}
+        )
+
+    def test_delete_business_with_archived_orders(self):
+        """
+        Ensure deleting a business user with archived orders leaves no
+        counter or rollup behind.
+        """
+        self.archive_orders(['completed', 'cancelled'])
+        self.business.delete()
+        self.assertFalse(ArchivedOrder.objects.exists())
+        self.assertFalse(
+            OrderCounter.objects.filter(pk=self.business.pk).exists())
+        self.assertFalse(OrderDailyRollup.objects.filter(
+            business_user_id=self.business.pk).exists())
+
+    def test_get_orders_with_archived(self):
+        """
+        Ensure archived orders are listed only when asked for.
+        """
+        orders = self.archive_orders(['completed', 'cancelled'])
+        self.client.force_authenticate(self.customer)
+        res = self.client.get(get_order_list_url())
+        self.assertEqual([o['id'] for o in res.data], [self.order.id])
+
+        expected = [self.order.id, orders[0].id, orders[1].id]
+        res = self.client.get(
+            get_order_list_url(), {'include_archived': 'true'})
+        self.assertEqual([o['id'] for o in res.data], expected)
+
+        before = timezone.now() - timedelta(days=200)
+        res = self.client.get(get_order_list_url(), {
+            'created_before': before.isoformat(),
+            'fields': 'id,status',
+        })
+        self.assertEqual(res.data, [
+            {'id': orders[0].id, 'status': 'completed'},
+            {'id': orders[1].id, 'status': 'cancelled'},
+        ])
+
+        ids, params = [], {
+            'paginate': 'cursor', 'page_size': 2, 'include_archived': '1'
+        }
+        res = self.client.get(get_order_list_url(), params)
+        while True:
+            ids += [o['id'] for o in res.data['results']]
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+        self.assertEqual(ids, expected)
+
+        res = self.client.get(get_order_list_url(), {
+            'format': 'csv', 'fields': 'id', 'include_archived': 'yes'
+        })
+        content = b''.join(res.streaming_content).decode()
+        self.assertEqual(
+            content.split(), ['id'] + [str(pk) for pk in expected])
+
     def test_get_orders_unauthenticated(self):
         """
         Ensure unauthenticated users cannot get order list (HTTP 401).
@@ -93,6 +286,59 @@ class OrderListCreateTests(APITestCase):
         self.assertEqual(data['business_user'], self.business.id)
         self.assertEqual(data['title'], self.detail.title)
 
+    def post_order_with_key(self, key, detail_id=None):
+        """
+        Post an order of the customer with an idempotency key.
+        """
+        payload = {'offer_detail_id': detail_id or self.detail.id}
+        return self.client.post(
+            get_order_list_url(), payload, format='json',
+            HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_post_order_idempotent(self):
+        """
+        Ensure a retried request replays the first response.
+        """
+        self.client.force_authenticate(self.customer)
+        first = self.post_order_with_key('retry-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        with self.assertNumQueries(1):
+            second = self.post_order_with_key('retry-1')
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_post_order_idempotency_key_reused(self):
+        """
+        Ensure a key reused for another request gets HTTP 422.
+        """
+        self.client.force_authenticate(self.customer)
+        self.post_order_with_key('retry-1')
+        other = OfferDetail.objects.create(
+            offer=self.detail.offer, title='Other', offer_type='premium')
+        res = self.post_order_with_key('retry-1', other.id)
+        self.assertEqual(
+            res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_post_order_idempotency_key_expired(self):
+        """
+        Ensure an expired key creates a new order and is purged.
+        """
+        self.client.force_authenticate(self.customer)
+        first = self.post_order_with_key('retry-1')
+        IdempotencyKey.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1))
+        second = self.post_order_with_key('retry-1')
+        self.assertNotEqual(second.data['id'], first.data['id'])
+
+        IdempotencyKey.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1))
+        call_command(
+            'purge_idempotency_keys', batch_size=1, stdout=StringIO())
+        self.assertFalse(IdempotencyKey.objects.exists())
+
     def test_post_order_missing_offer_detail(self):
         """
         Ensure a request with missing offer detail gets HTTP 400.
@@ -0,0 +1,161 @@
+# Standard libraries
+from datetime import timedelta
+from io import StringIO
+
+# Third-party suppliers
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Local imports
+from auth_app.models import CustomUser
+from order_app.api.services import BulkOrderStatus
+from order_app.models import Order, OrderCounter, OrderDailyRollup
+
+
+def get_order_rollups_url(business_id):
+    """
+    Get URL of order rollups.
+    """
+    return reverse('order-rollups', args=[business_id])
+
+
+class OrderRollupTests(APITestCase):
+    """
+    Tests for maintaining and reading daily order rollups.
+    """
+
+    def setUp(self):
+        """
+        Set up sample users and orders of today and two days ago.
+        """
+        self.business = CustomUser.objects.create_user(
+            username='biz', password='pass', type='business'
+        )
+        self.customer = CustomUser.objects.create_user(
+            username='cust', password='pass', type='customer'
+        )
+        self.today = timezone.localdate()
+        self.orders = [
+            Order.objects.create(
+                customer_user=self.customer, business_user=self.business,
+                title=f'Order {idx}', price=price, offer_type='basic'
+            )
+            for idx, price in enumerate([100, 200, 50])
+        ]
+        older = self.orders[2]
+        older.created_at = timezone.now() - timedelta(days=2)
+        older.save()
+
+    def get_rollups(self):
+        """
+        Get (day, status, order_count, revenue) of all rollups.
+        """
+        return set(
+            OrderDailyRollup.objects.filter(order_count__gt=0)
+            .values_list('day', 'status', 'order_count', 'revenue')
+        )
+
+    def test_rollups_follow_order_writes(self):
+        """
+        Ensure rollups follow creating, updating and deleting orders.
+        """
+        two_days_ago = self.today - timedelta(days=2)
+        self.assertEqual(self.get_rollups(), {
+            (self.today, 'in_progress', 2, 300),
+            (two_days_ago, 'in_progress', 1, 50),
+        })
+        self.orders[0].status = 'completed'
+        self.orders[0].save()
+        BulkOrderStatus.update(
+            self.business, [self.orders[1].pk, self.orders[2].pk], 'cancelled')
+        self.orders[1].refresh_from_db()
+        self.orders[1].delete()
+        expected = {
+            (self.today, 'completed', 1, 100),
+            (two_days_ago, 'cancelled', 1, 50),
+        }
+        self.assertEqual(self.get_rollups(), expected)
+
+        OrderDailyRollup.objects.all().delete()
+        call_command('rebuild_order_rollups', stdout=StringIO())
+        self.assertEqual(self.get_rollups(), expected)
+
+    def test_rollups_follow_deferred_and_stale_order_writes(self):
+        """
+        Ensure rollups follow the stored state when orders are saved
+        after a deferred load or deleted after a concurrent change.
+        """
+        order = Order.objects.only('id').get(pk=self.orders[0].pk)
+        order.status = 'completed'
+        order.save()
+        BulkOrderStatus.update(
+            self.business, [self.orders[1].pk], 'cancelled')
+        self.orders[1].delete()
+        self.assertEqual(self.get_rollups(), {
+            (self.today, 'completed', 1, 100),
+            (self.today - timedelta(days=2), 'in_progress', 1, 50),
+        })
+
+    def test_delete_business_with_orders(self):
+        """
+        Ensure deleting a business user with orders leaves no counter or
+        rollup behind.
+        """
+        self.business.delete()
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(OrderCounter.objects.exists())
+        self.assertFalse(OrderDailyRollup.objects.exists())
+
+    def test_get_order_rollups(self):
+        """
+        Ensure the series has one entry per day, including empty days.
+        """
+        self.client.force_authenticate(self.business)
+        res = self.client.get(get_order_rollups_url(self.business.id), {
+            'start': (self.today - timedelta(days=3)).isoformat()
+        })
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(day['order_count'], day['revenue']) for day in res.data],
+            [(0, 0), (1, 50), (0, 0), (2, 300)]
+        )
+        self.assertEqual(res.data[-1]['day'], self.today.isoformat())
+
+        res = self.client.get(
+            get_order_rollups_url(self.business.id), {'status': 'completed'})
+        self.assertEqual(len(res.data), 30)
+        self.assertFalse(any(day['order_count'] for day in res.data))
+
+    def test_get_order_rollups_invalid_range(self):
+        """
+        Ensure invalid or too long ranges get HTTP 400.
+        """
+        self.client.force_authenticate(self.business)
+        url = get_order_rollups_url(self.business.id)
+        for params in [
+            {'start': 'yesterday'},
+            {'start': '2026-02-01', 'end': '2026-01-01'},
+            {'start': '2024-01-01', 'end': '2026-01-01'},
+        ]:
+            res = self.client.get(url, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_order_rollups_forbidden(self):
+        """
+        Ensure only the business user and staff read the rollups.
+        """
+        url = get_order_rollups_url(self.business.id)
+        self.client.force_authenticate(self.customer)
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        staff = CustomUser.objects.create_user(
+            username='admin', password='pass', type='customer', is_staff=True
+        )
+        self.client.force_authenticate(staff)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        res = self.client.get(get_order_rollups_url(self.customer.id))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,92 @@
+# Standard libraries
+import uuid
+from datetime import timedelta
+
+# Third-party suppliers
+from django.db.models import F, Q
+from django.utils import timezone
+
+# Local imports
+from outbox_app.models import OutboxEvent
+
+
+class OutboxDeliveryError(Exception):
+    """
+    Raised if a handler failed to deliver a batch of events.
+    """
+
+
+class OutboxDispatcher:
+    """
+    Dispatcher delivering pending outbox events to the handlers in
+    batches.
+
+    A batch is claimed with a lease by a single conditional update,
+    delivered outside of any transaction and marked dispatched only
+    after every handler accepted it, so a failed batch, or one whose
+    worker died, is delivered again (at least once). Workers never
+    deliver a batch leased by another worker.
+    """
+
+    def __init__(self, handlers, batch_size=100, lease_seconds=300):
+        """
+        Set the handlers, the number of events per batch and the seconds
+        a claimed batch is leased to this worker.
+        """
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.lease = timedelta(seconds=lease_seconds)
+
+    def claim_batch(self):
+        """
+        Claim the oldest pending events not leased by another worker
+        with one conditional update and get them with their claim token.
+        """
+        now = timezone.now()
+        token = uuid.uuid4().hex
+        claimable = OutboxEvent.objects.filter(
+            Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - self.lease),
+            dispatched_at__isnull=True,
+        )
+        oldest = claimable.order_by('pk').values('pk')[:self.batch_size]
+        claimable.filter(pk__in=oldest).update(
+            claimed_at=now, claim_token=token)
+        events = OutboxEvent.objects.filter(claim_token=token).order_by('pk')
+        return list(events), token
+
+    def dispatch_batch(self):
+        """
+        Deliver one batch of events and get the amount delivered, or
+        raise OutboxDeliveryError after counting the failed attempt.
+        """
+        events, token = self.claim_batch()
+        if not events:
+            return 0
+        messages = [event.to_message() for event in events]
+        batch = OutboxEvent.objects.filter(claim_token=token)
+        try:
+            for handler in self.handlers:
+                handler.deliver(messages)
+        except Exception as exc:
+            batch.update(
+                attempts=F('attempts') + 1, last_error=repr(exc),
+                claimed_at=None
+            )
+            raise OutboxDeliveryError(exc) from exc
+        batch.update(
+            attempts=F('attempts') + 1, last_error='',
+            dispatched_at=timezone.now()
+        )
+        return len(events)
+
+    def dispatch(self):
+        """
+        Deliver batches until no event is pending and get the amount
+        delivered.
+        """
+        total = 0
+        while True:
+            amount = self.dispatch_batch()
+            total += amount
+            if amount < self.batch_size:
+                return total
@@ -0,0 +1,105 @@
+# Standard libraries
+import json
+import os
+import socket
+
+# Third-party suppliers
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+
+def get_lines(messages):
+    """
+    Get messages encoded as JSON lines.
+    """
+    return b''.join(
+        json.dumps(message, cls=DjangoJSONEncoder).encode() + b'\n'
+        for message in messages
+    )
+
+
+class CallableHandler:
+    """
+    Handler calling a function, given by dotted path, per message.
+    """
+
+    def __init__(self, path):
+        """
+        Import the function to call.
+        """
+        self.func = import_string(path)
+
+    def deliver(self, messages):
+        """
+        Deliver messages in order.
+        """
+        for message in messages:
+            self.func(message)
+
+
+class FileHandler:
+    """
+    Handler appending messages as JSON lines to a file.
+    """
+
+    def __init__(self, path):
+        """
+        Set the path of the file.
+        """
+        self.path = path
+
+    def deliver(self, messages):
+        """
+        Append messages and sync them to disk before they count as
+        delivered.
+        """
+        with open(self.path, 'ab') as file:
+            file.write(get_lines(messages))
+            file.flush()
+            os.fsync(file.fileno())
+
+
+class UnixSocketHandler:
+    """
+    Handler sending messages as JSON lines to a Unix domain socket.
+    """
+
+    def __init__(self, path, timeout=5.0):
+        """
+        Set the path of the socket and the timeout of sending.
+        """
+        self.path = path
+        self.timeout = timeout
+
+    def deliver(self, messages):
+        """
+        Send messages over one connection.
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            sock.sendall(get_lines(messages))
+
+
+HANDLER_CLASSES = {
+    'callable': CallableHandler,
+    'file': FileHandler,
+    'socket': UnixSocketHandler,
+}
+
+
+def get_handlers():
+    """
+    Get the handlers configured by OUTBOX_HANDLERS.
+    """
+    handlers = []
+    for config in settings.OUTBOX_HANDLERS:
+        options = dict(config)
+        handler_type = options.pop('type', None)
+        if handler_type not in HANDLER_CLASSES:
+            raise ImproperlyConfigured(
+                f'Unknown outbox handler type: {handler_type}')
+        handlers.append(HANDLER_CLASSES[handler_type](**options))
+    return handlers
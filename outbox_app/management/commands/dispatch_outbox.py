@@ -0,0 +1,80 @@
+# Standard libraries
+import time
+
+# Third-party suppliers
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError
+
+# Local imports
+from outbox_app.dispatcher import OutboxDeliveryError, OutboxDispatcher
+from outbox_app.handlers import get_handlers
+
+
+class Command(BaseCommand):
+    """
+    Deliver pending outbox events to the configured handlers.
+    """
+    help = 'Deliver pending outbox events in batches.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+        """
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE,
+            help='Number of events delivered per batch.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for new events instead of exiting.'
+        )
+        parser.add_argument(
+            '--interval', type=float,
+            default=settings.OUTBOX_POLL_INTERVAL,
+            help='Seconds to wait between polls or after a failure.'
+        )
+        parser.add_argument(
+            '--lease-seconds', type=int,
+            default=settings.OUTBOX_LEASE_SECONDS,
+            help='Seconds a claimed batch is leased to this worker.'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Deliver pending events once, or until interrupted with --loop.
+        """
+        handlers = get_handlers()
+        if not handlers:
+            raise CommandError('No outbox handlers configured.')
+        dispatcher = OutboxDispatcher(
+            handlers, options['batch_size'], options['lease_seconds'])
+        if not options['loop']:
+            try:
+                total = dispatcher.dispatch()
+            except OutboxDeliveryError as exc:
+                raise CommandError(f'Delivery failed: {exc}')
+            self.stdout.write(f'Dispatched {total} outbox events.')
+            return
+        try:
+            while True:
+                self.dispatch_pending(dispatcher)
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+    def dispatch_pending(self, dispatcher):
+        """
+        Deliver pending events, reporting a failure or a busy database
+        instead of exiting, to retry after the interval.
+        """
+        try:
+            total = dispatcher.dispatch()
+        except OutboxDeliveryError as exc:
+            self.stderr.write(f'Delivery failed: {exc}')
+            return
+        except OperationalError as exc:
+            self.stderr.write(f'Database unavailable: {exc}')
+            return
+        if total:
+            self.stdout.write(f'Dispatched {total} outbox events.')
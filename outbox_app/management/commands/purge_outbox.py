@@ -0,0 +1,44 @@
+# Standard libraries
+from datetime import timedelta
+
+# Third-party suppliers
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+# Local imports
+from outbox_app.models import OutboxEvent
+
+
+class Command(BaseCommand):
+    """
+    Remove dispatched outbox events in batches.
+    """
+    help = 'Remove outbox events dispatched before the retention time.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+        """
+        parser.add_argument(
+            '--days', type=int, default=settings.OUTBOX_RETENTION_DAYS,
+            help='Days a dispatched event is kept.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of events removed per query.'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Remove old dispatched events one batch at a time.
+        """
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        dispatched = OutboxEvent.objects.filter(dispatched_at__lt=cutoff)
+        batch_size, total = options['batch_size'], 0
+        while True:
+            pks = list(dispatched.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            total += OutboxEvent.objects.filter(pk__in=pks).delete()[0]
+        self.stdout.write(f'Removed {total} dispatched outbox events.')
@@ -0,0 +1,59 @@
+# Third-party suppliers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class OutboxEvent(models.Model):
+    """
+    Represents an event written in the transaction of the change it
+    describes, delivered to the outbox handlers by the dispatcher.
+    """
+    topic = models.CharField(max_length=100)
+    aggregate_id = models.BigIntegerField()
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    claim_token = models.CharField(max_length=32, blank=True, default='')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Outbox Event'
+        verbose_name_plural = 'Outbox Events'
+        indexes = [
+            models.Index(
+                fields=['id'], condition=Q(dispatched_at__isnull=True),
+                name='outbox_pending_idx'
+            ),
+            models.Index(fields=['dispatched_at']),
+            models.Index(fields=['claim_token']),
+        ]
+
+    def __str__(self):
+        """
+        Get a string representing an outbox event.
+        """
+        return f"{self.topic} #{self.aggregate_id}"
+
+    @classmethod
+    def build(cls, topic, aggregate_id, payload):
+        """
+        Get an unsaved event, e.g. for a bulk insert.
+        """
+        return cls(topic=topic, aggregate_id=aggregate_id, payload=payload)
+
+    def to_message(self):
+        """
+        Get the message delivered to the handlers.
+        """
+        return {
+            'id': self.pk,
+            'topic': self.topic,
+            'aggregate_id': self.aggregate_id,
+            'payload': self.payload,
+            'created_at': self.created_at.isoformat(),
+        }
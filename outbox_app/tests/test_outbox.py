@@ -0,0 +1,256 @@
+# Standard libraries
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+# Third-party suppliers
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import OperationalError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+# Local imports
+from order_app.api.services import BulkOrderStatus
+from order_app.models import Order
+from outbox_app.dispatcher import OutboxDeliveryError, OutboxDispatcher
+from outbox_app.handlers import CallableHandler, UnixSocketHandler
+from outbox_app.management.commands.dispatch_outbox import Command
+from outbox_app.models import OutboxEvent
+from review_app.models import Review
+
+User = get_user_model()
+
+delivered = []
+
+
+def collect(message):
+    """
+    Collect a delivered message.
+    """
+    delivered.append(message)
+
+
+def fail(message):
+    """
+    Fail to deliver a message.
+    """
+    raise ConnectionError('handler down')
+
+
+class OutboxTests(TestCase):
+    """
+    Tests for recording and dispatching outbox events.
+    """
+
+    def setUp(self):
+        """
+        Set up a customer, a business user and an order.
+        """
+        self.customer = User.objects.create_user(
+            username='cust', password='pass', type='customer'
+        )
+        self.business = User.objects.create_user(
+            username='biz', password='pass', type='business'
+        )
+        self.order = Order.objects.create(
+            customer_user=self.customer, business_user=self.business,
+            title='Logo', price=150, offer_type='basic'
+        )
+        delivered.clear()
+
+    def get_topics(self):
+        """
+        Get the topics of all recorded events.
+        """
+        return list(OutboxEvent.objects.values_list('topic', flat=True))
+
+    def test_order_events(self):
+        """
+        Ensure order creation, status changes and deletes are recorded.
+        """
+        self.order.status = 'completed'
+        self.order.save()
+        order_id = self.order.pk
+        self.order.delete()
+        self.assertEqual(self.get_topics(), [
+            'order.created', 'order.status_changed', 'order.deleted'
+        ])
+        event = OutboxEvent.objects.get(topic='order.status_changed')
+        self.assertEqual(event.aggregate_id, order_id)
+        self.assertEqual(event.payload, {
+            'customer_user': self.customer.pk,
+            'business_user': self.business.pk,
+            'status': 'completed',
+            'previous_status': 'in_progress',
+            'price': 150,
+        })
+
+    def test_bulk_status_events(self):
+        """
+        Ensure a bulk status change records one event per changed order.
+        """
+        BulkOrderStatus.update(self.business, [self.order.pk], 'cancelled')
+        event = OutboxEvent.objects.get(topic='order.status_changed')
+        self.assertEqual(event.payload['status'], 'cancelled')
+        self.assertEqual(event.payload['previous_status'], 'in_progress')
+
+    def test_review_events(self):
+        """
+        Ensure review creation, updates and deletes are recorded.
+        """
+        review = Review.objects.create(
+            business_user=self.business, reviewer=self.customer, rating=4)
+        review.rating = 5
+        review.save()
+        review.delete()
+        self.assertEqual(self.get_topics()[1:], [
+            'review.created', 'review.updated', 'review.deleted'
+        ])
+
+    def test_event_rolled_back_with_change(self):
+        """
+        Ensure no event is left by a rolled back change.
+        """
+        with transaction.atomic():
+            Order.objects.create(
+                customer_user=self.customer, business_user=self.business,
+                title='Card', offer_type='basic'
+            )
+            transaction.set_rollback(True)
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+    def test_dispatch_in_batches(self):
+        """
+        Ensure all pending events are delivered in order and marked.
+        """
+        for status in ['completed', 'cancelled', 'in_progress']:
+            self.order.status = status
+            self.order.save()
+        dispatcher = OutboxDispatcher(
+            [CallableHandler('outbox_app.tests.test_outbox.collect')],
+            batch_size=3
+        )
+        self.assertEqual(dispatcher.dispatch(), 4)
+        self.assertEqual(
+            [message['id'] for message in delivered],
+            list(OutboxEvent.objects.values_list('pk', flat=True))
+        )
+        self.assertFalse(
+            OutboxEvent.objects.filter(dispatched_at__isnull=True).exists())
+        self.assertEqual(dispatcher.dispatch(), 0)
+
+    def test_failed_delivery_is_retried(self):
+        """
+        Ensure events stay pending after a failed delivery.
+        """
+        dispatcher = OutboxDispatcher(
+            [CallableHandler('outbox_app.tests.test_outbox.fail')])
+        with self.assertRaises(OutboxDeliveryError):
+            dispatcher.dispatch()
+        event = OutboxEvent.objects.get()
+        self.assertIsNone(event.dispatched_at)
+        self.assertEqual(event.attempts, 1)
+        self.assertIn('handler down', event.last_error)
+
+        dispatcher.handlers = [
+            CallableHandler('outbox_app.tests.test_outbox.collect')]
+        self.assertEqual(dispatcher.dispatch(), 1)
+        self.assertEqual(delivered[0]['topic'], 'order.created')
+
+    def test_claimed_batch_not_delivered_twice(self):
+        """
+        Ensure a batch leased to one worker is not delivered by another
+        until its lease expired.
+        """
+        first = OutboxDispatcher([], lease_seconds=60)
+        second = OutboxDispatcher(
+            [CallableHandler('outbox_app.tests.test_outbox.collect')],
+            lease_seconds=60
+        )
+        events, token = first.claim_batch()
+        self.assertEqual(len(events), 1)
+        self.assertEqual(second.dispatch(), 0)
+        self.assertEqual(delivered, [])
+
+        OutboxEvent.objects.filter(claim_token=token).update(
+            claimed_at=timezone.now() - timedelta(seconds=61))
+        self.assertEqual(second.dispatch(), 1)
+        self.assertEqual(delivered[0]['id'], events[0].pk)
+        self.assertEqual(first.claim_batch()[0], [])
+
+    def test_claim_is_one_update(self):
+        """
+        Ensure a batch is claimed by one conditional update without a
+        separate read before it.
+        """
+        dispatcher = OutboxDispatcher([])
+        with self.assertNumQueries(2):
+            events, token = dispatcher.claim_batch()
+        self.assertEqual([event.claim_token for event in events], [token])
+
+    def test_dispatch_loop_survives_locked_database(self):
+        """
+        Ensure a busy database is reported by the polling loop instead
+        of stopping the worker.
+        """
+        dispatcher = OutboxDispatcher([])
+        stderr = StringIO()
+        command = Command(stdout=StringIO(), stderr=stderr)
+        locked = OperationalError('database is locked')
+        with mock.patch.object(dispatcher, 'dispatch', side_effect=locked):
+            command.dispatch_pending(dispatcher)
+        self.assertIn('database is locked', stderr.getvalue())
+
+    def test_dispatch_command_to_file(self):
+        """
+        Ensure the command appends the events as JSON lines.
+        """
+        path = os.path.join(tempfile.mkdtemp(), 'events.jsonl')
+        handlers = [{'type': 'file', 'path': path}]
+        with override_settings(OUTBOX_HANDLERS=handlers):
+            call_command('dispatch_outbox', stdout=StringIO())
+        with open(path) as file:
+            lines = [json.loads(line) for line in file]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]['aggregate_id'], self.order.pk)
+        shutil.rmtree(os.path.dirname(path))
+
+    def test_dispatch_command_without_handlers(self):
+        """
+        Ensure the command refuses to drop events without handlers.
+        """
+        with override_settings(OUTBOX_HANDLERS=[]):
+            with self.assertRaises(CommandError):
+                call_command('dispatch_outbox', stdout=StringIO())
+        self.assertTrue(
+            OutboxEvent.objects.filter(dispatched_at__isnull=True).exists())
+
+    def test_deliver_to_unix_socket(self):
+        """
+        Ensure messages are sent as JSON lines over a Unix socket.
+        """
+        path = os.path.join(tempfile.mkdtemp(), 'events.sock')
+        received = []
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(path)
+            server.listen(1)
+
+            def receive():
+                conn, _ = server.accept()
+                with conn, conn.makefile('rb') as file:
+                    received.extend(json.loads(line) for line in file)
+
+            thread = threading.Thread(target=receive)
+            thread.start()
+            UnixSocketHandler(path).deliver([{'id': 1}, {'id': 2}])
+            thread.join(timeout=5)
+        shutil.rmtree(os.path.dirname(path))
+        self.assertEqual(received, [{'id': 1}, {'id': 2}])
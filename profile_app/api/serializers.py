@@ -2,6 +2,10 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+# Local imports
+from core.api.fields import ImageVariantsField
+from core.images import schedule_variants
+
 User = get_user_model()
 
 
@@ -10,12 +14,13 @@ class BaseProfileSerializer(serializers.ModelSerializer):
     Base serializer for user profiles.
     """
     user = serializers.IntegerField(source='id', read_only=True)
+    file_variants = ImageVariantsField('file')
 
     class Meta:
         model = User
         fields = [
             'user', 'username', 'first_name',
-            'last_name', 'file'
+            'last_name', 'file', 'file_variants'
         ]
         read_only_fields = ['user', 'username']
 
@@ -26,9 +31,23 @@ class BaseProfileSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
+        if 'file' in validated_data:
+            schedule_variants(instance.file)
         return instance
 
 
+class PublicProfileSerializer(BaseProfileSerializer):
+    """
+    Serializer for the public part of a user profile, shown to
+    anonymous users.
+    """
+    class Meta(BaseProfileSerializer.Meta):
+        fields = [
+            'user', 'username', 'first_name', 'last_name', 'file_variants'
+        ]
+        read_only_fields = fields
+
+
 class BusinessProfileListSerializer(BaseProfileSerializer):
     """
     List serializer for business user profiles.
@@ -8,6 +8,7 @@ from rest_framework.response import Response
 from rest_framework import filters, status, serializers
 
 # Local imports
+from core.api.mixins import SparseFieldsMixin, StreamingExportMixin
 from review_app.api.filters import ReviewFilter
 from review_app.api.permissions import IsCustomerProfile, IsReviewer
 from review_app.api.serializers import ReviewSerializer
@@ -15,7 +16,9 @@ from review_app.api.throttling import ReviewThrottle
 from review_app.models import Review
 
 
-class ReviewListCreateAPIView(ListCreateAPIView):
+class ReviewListCreateAPIView(
+    SparseFieldsMixin, StreamingExportMixin, ListCreateAPIView
+):
     """
     View for listing and creating reviews.
     """
@@ -27,6 +30,16 @@ class ReviewListCreateAPIView(ListCreateAPIView):
     filterset_class = ReviewFilter
     ordering_fields = ['updated_at', 'rating']
     ordering = ['-updated_at', '-rating']
+    export_filename = 'reviews'
+
+    def list(self, request, *args, **kwargs):
+        """
+        Get review list, streamed if an export is requested.
+        """
+        if self.is_export():
+            return self.get_export_response(
+                self.filter_queryset(self.get_queryset()))
+        return super().list(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         """
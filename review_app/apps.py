@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ReviewAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'review_app'
+
+    def ready(self):
+        """
+        Connect review signal receivers.
+        """
+        from review_app import signals  # noqa: F401
@@ -1,8 +1,9 @@
 # Third-party suppliers
-from django.db import models
+from django.db import models, transaction
 
 # Local imports
 from auth_app.models import CustomUser
+from outbox_app.models import OutboxEvent
 
 
 class Review(models.Model):
@@ -28,3 +29,24 @@ class Review(models.Model):
         Get a string representing a review.
         """
         return f"{self.business_user} {self.rating} by {self.reviewer}"
+
+    def get_event(self, topic):
+        """
+        Get an outbox event describing a change of the review.
+        """
+        return OutboxEvent.build(topic, self.pk, {
+            'business_user': self.business_user_id,
+            'reviewer': self.reviewer_id,
+            'rating': self.rating,
+        })
+
+    def save(self, *args, **kwargs):
+        """
+        Save a review and record its outbox event in the same
+        transaction.
+        """
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            topic = 'review.created' if adding else 'review.updated'
+            self.get_event(topic).save()
@@ -0,0 +1,15 @@
+# Third-party suppliers
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+# Local imports
+from review_app.models import Review
+
+
+@receiver(post_delete, sender=Review)
+def record_event_on_delete(sender, instance, **kwargs):
+    """
+    Record the outbox event of a deleted review, within the transaction
+    of the delete.
+    """
+    instance.get_event('review.deleted').save()
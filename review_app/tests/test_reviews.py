@@ -45,6 +45,30 @@ class ReviewAPITests(APITestCase):
         self.assertIsInstance(response.data, list)
         self.assertEqual(len(response.data), 1)
 
+    def test_get_reviews_sparse_fields(self):
+        """
+        Ensure '?omit=' leaves fields out of the review list.
+        """
+        self.client.force_authenticate(user=self.customer_user)
+        response = self.client.get(
+            self.review_url, {'omit': 'description,updated_at'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {
+            'id', 'business_user', 'reviewer', 'rating', 'created_at'
+        })
+
+    def test_export_reviews_ndjson(self):
+        """
+        Ensure reviews are streamed as NDJSON requested by Accept header.
+        """
+        self.client.force_authenticate(user=self.customer_user)
+        response = self.client.get(
+            self.review_url, HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertIn(b'"rating": 4', lines[0])
+
     def test_get_reviews_unauthenticated(self):
         """
         Ensure unauthenticated users cannot get reviews (HTTP 401).
@@ -0,0 +1,8 @@
+# Third-party suppliers
+from django.contrib import admin
+
+# Local imports
+from .models import Upload
+
+
+admin.site.register(Upload)
@@ -0,0 +1,64 @@
+# Standard libraries
+import os
+
+# Third-party suppliers
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils.text import get_valid_filename
+from rest_framework import serializers
+
+# Local imports
+from offer_app.models import Offer
+from upload_app.models import Upload
+
+
+class UploadSerializer(serializers.ModelSerializer):
+    """
+    Serializer for starting uploads and reporting their progress.
+    """
+
+    class Meta:
+        model = Upload
+        fields = ['id', 'filename', 'size', 'offset', 'status', 'created_at']
+        read_only_fields = ['id', 'offset', 'status', 'created_at']
+
+    def validate_filename(self, value):
+        """
+        Validate the filename to be safe for storage.
+        """
+        try:
+            return get_valid_filename(os.path.basename(value))
+        except SuspiciousFileOperation:
+            raise serializers.ValidationError('Invalid filename.')
+
+    def validate_size(self, value):
+        """
+        Validate the size to be within the upload limit.
+        """
+        if not 0 < value <= settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'Size must be between 1 and {settings.UPLOAD_MAX_SIZE}.'
+            )
+        return value
+
+
+class UploadCompleteSerializer(serializers.Serializer):
+    """
+    Serializer for attaching a completed upload to an offer or profile.
+    """
+    TARGETS = ('offer', 'profile')
+
+    target = serializers.ChoiceField(choices=TARGETS)
+    offer = serializers.PrimaryKeyRelatedField(
+        queryset=Offer.objects.all(), required=False
+    )
+
+    def validate(self, data):
+        """
+        Validate an offer to be given for the offer target.
+        """
+        if data['target'] == 'offer' and 'offer' not in data:
+            raise serializers.ValidationError({
+                'offer': 'offer is required.'
+            })
+        return data
@@ -0,0 +1,18 @@
+# Third-party suppliers
+from django.urls import path
+
+# Local imports
+from upload_app.api.views import (
+    UploadCompleteAPIView, UploadCreateAPIView, UploadDetailAPIView
+)
+
+
+urlpatterns = [
+    path('', UploadCreateAPIView.as_view(), name='upload-create'),
+    path('<uuid:pk>/', UploadDetailAPIView.as_view(), name='upload-detail'),
+    path(
+        '<uuid:pk>/complete/',
+        UploadCompleteAPIView.as_view(),
+        name='upload-complete'
+    ),
+]
@@ -0,0 +1,195 @@
+# Third-party suppliers
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.generics import (
+    CreateAPIView, GenericAPIView, RetrieveDestroyAPIView
+)
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+# Local imports
+from core.images import schedule_variants
+from upload_app.api.serializers import (
+    UploadCompleteSerializer, UploadSerializer
+)
+from upload_app.models import Upload
+
+
+class UploadQuerysetMixin:
+    """
+    Mixin restricting uploads to those of the requesting user.
+    """
+    serializer_class = UploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Get uploads of the requesting user.
+        """
+        return Upload.objects.filter(user=self.request.user)
+
+    def get_locked_upload(self, pk):
+        """
+        Get an upload locked for the current transaction.
+        """
+        return get_object_or_404(
+            self.get_queryset().select_for_update(), pk=pk)
+
+    def handle_conflict(self, upload, detail):
+        """
+        Handle the case 'Conflict', reporting the current offset.
+        """
+        return Response(
+            {'detail': detail, 'offset': upload.offset},
+            status=status.HTTP_409_CONFLICT,
+            headers={'Upload-Offset': str(upload.offset)}
+        )
+
+
+class UploadCreateAPIView(UploadQuerysetMixin, CreateAPIView):
+    """
+    View for starting a resumable upload.
+    """
+
+    def perform_create(self, serializer):
+        """
+        Save a new upload of the requesting user.
+        """
+        serializer.save(user=self.request.user)
+
+
+class UploadDetailAPIView(UploadQuerysetMixin, RetrieveDestroyAPIView):
+    """
+    View for getting the progress of, appending a chunk to and
+    aborting an upload.
+    """
+
+    def get_header_int(self, request, name):
+        """
+        Get a header as non-negative integer, or None if invalid.
+        """
+        try:
+            value = int(request.META[name])
+        except (KeyError, ValueError):
+            return None
+        return value if value >= 0 else None
+
+    def put(self, request, pk):
+        """
+        Append the request body at the offset given by 'Upload-Offset'.
+
+        The body is read outside of any transaction, so a slow client
+        holds no database lock, and the offset is advanced only if no
+        other chunk was counted meanwhile.
+        """
+        offset = self.get_header_int(request, 'HTTP_UPLOAD_OFFSET')
+        if offset is None:
+            return Response(
+                {'detail': 'Upload-Offset header is required.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        length = self.get_header_int(request, 'CONTENT_LENGTH')
+        if length is None:
+            return Response(
+                {'detail': 'Content-Length header is required.'},
+                status=status.HTTP_411_LENGTH_REQUIRED
+            )
+
+        upload = get_object_or_404(self.get_queryset(), pk=pk)
+        response = self.check_chunk(upload, offset, length)
+        if response is not None:
+            return response
+        if length:
+            try:
+                with upload.open_locked() as file:
+                    upload.refresh_from_db(fields=['offset', 'status'])
+                    response = self.check_chunk(upload, offset, length)
+                    if response is not None:
+                        return response
+                    written = upload.write_chunk(file, request.stream, length)
+                    if not upload.advance(written):
+                        upload.refresh_from_db(fields=['offset'])
+                        return self.handle_conflict(upload, 'Offset mismatch.')
+            except BlockingIOError:
+                return self.handle_conflict(
+                    upload, 'Another chunk is being written.')
+
+        return Response(
+            self.get_serializer(upload).data,
+            headers={'Upload-Offset': str(upload.offset)}
+        )
+
+    def check_chunk(self, upload, offset, length):
+        """
+        Get an error response if the chunk does not fit the upload, or
+        None.
+        """
+        if upload.status != 'pending':
+            return self.handle_conflict(upload, 'Upload is completed.')
+        if offset != upload.offset:
+            return self.handle_conflict(upload, 'Offset mismatch.')
+        if offset + length > upload.size:
+            return Response(
+                {'detail': 'Chunk exceeds the upload size.'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        return None
+
+    def perform_destroy(self, instance):
+        """
+        Abort an upload, removing its temporary file.
+        """
+        instance.remove_file()
+        instance.delete()
+
+
+class UploadCompleteAPIView(UploadQuerysetMixin, GenericAPIView):
+    """
+    View for attaching a completed upload to an offer or profile.
+    """
+
+    def get_target_file(self, request, data):
+        """
+        Get the image field file to attach the upload to.
+        """
+        if data['target'] == 'offer':
+            return data['offer'].image
+        return request.user.file
+
+    def post(self, request, pk):
+        """
+        Validate the assembled image once and attach it.
+        """
+        serializer = UploadCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        offer = serializer.validated_data.get('offer')
+        if offer is not None and offer.user_id != request.user.id:
+            return Response(
+                {'detail': 'Forbidden.'}, status=status.HTTP_403_FORBIDDEN
+            )
+
+        with transaction.atomic():
+            upload = self.get_locked_upload(pk)
+            if upload.status != 'pending' or not upload.is_complete:
+                return self.handle_conflict(upload, 'Upload is incomplete.')
+            if upload.get_image_format() not in settings.UPLOAD_IMAGE_FORMATS:
+                return Response(
+                    {'detail': 'Upload is no valid image.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            field_file = self.get_target_file(
+                request, serializer.validated_data)
+            with open(upload.path, 'rb') as file:
+                field_file.save(upload.filename, File(file))
+            schedule_variants(field_file)
+            upload.status = 'completed'
+            upload.save(update_fields=['status', 'updated_at'])
+            transaction.on_commit(upload.remove_file)
+
+        return Response({
+            **self.get_serializer(upload).data,
+            'url': request.build_absolute_uri(field_file.url),
+        })
@@ -0,0 +1,40 @@
+# Standard libraries
+from datetime import timedelta
+
+# Third-party suppliers
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+# Local imports
+from upload_app.models import Upload
+
+
+class Command(BaseCommand):
+    """
+    Remove uploads and their temporary files once they expired.
+    """
+    help = 'Remove uploads not updated within the expiry time.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+        """
+        parser.add_argument(
+            '--hours', type=int, default=settings.UPLOAD_EXPIRY_HOURS,
+            help='Hours after the last chunk until an upload expires.'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Remove expired uploads.
+        """
+        expired = Upload.objects.filter(
+            updated_at__lt=timezone.now() - timedelta(hours=options['hours'])
+        )
+        pks = []
+        for upload in expired.iterator():
+            upload.remove_file()
+            pks.append(upload.pk)
+        Upload.objects.filter(pk__in=pks).delete()
+        self.stdout.write(f'Removed {len(pks)} expired uploads.')
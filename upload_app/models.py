@@ -0,0 +1,142 @@
+# Standard libraries
+import os
+import uuid
+from contextlib import contextmanager
+
+# Third-party suppliers
+from django.conf import settings
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+from PIL import Image, UnidentifiedImageError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Local imports
+from auth_app.models import CustomUser
+
+
+class Upload(models.Model):
+    """
+    Represents a resumable upload, whose chunks are streamed to a
+    temporary file until it is attached to an offer or profile.
+    """
+    STATUSES = (
+        ('pending', 'Pending'),
+        ('completed', 'Completed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name="uploads"
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(
+        max_length=10, choices=STATUSES, default='pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Upload"
+        verbose_name_plural = "Uploads"
+
+    def __str__(self):
+        """
+        Get a string representing an upload.
+        """
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def path(self):
+        """
+        Get the path of the temporary file.
+        """
+        return os.path.join(settings.UPLOAD_TEMP_DIR, f'{self.pk}.part')
+
+    @property
+    def is_complete(self):
+        """
+        Check all bytes to be received.
+        """
+        return self.offset == self.size
+
+    @contextmanager
+    def open_locked(self):
+        """
+        Open the temporary file, locked against chunks written at the
+        same time, or raise BlockingIOError if it is locked.
+
+        Without fcntl (Windows) the file is not locked, and only the
+        offset update guards against concurrent chunks.
+        """
+        os.makedirs(settings.UPLOAD_TEMP_DIR, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with open(fd, 'r+b') as file:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            yield file
+
+    def write_chunk(self, file, stream, length):
+        """
+        Write up to length bytes read from a stream into the open file
+        at the current offset and get the amount written.
+
+        Bytes behind the offset, left by an interrupted chunk that was
+        never counted, are cut off first. The stream is copied in small
+        buffers, so memory stays bounded. If the connection drops, the
+        bytes received so far stay written, so once they are counted
+        the client can resume after them.
+        """
+        file.seek(self.offset)
+        file.truncate()
+        remaining = length
+        while remaining:
+            data = stream.read(min(settings.UPLOAD_BUFFER_SIZE, remaining))
+            if not data:
+                break
+            file.write(data)
+            remaining -= len(data)
+        file.flush()
+        return length - remaining
+
+    def advance(self, written):
+        """
+        Count written bytes, only if the offset is still the one they
+        were written at, and check them to be counted.
+        """
+        updated = Upload.objects.filter(
+            pk=self.pk, offset=self.offset, status='pending'
+        ).update(
+            offset=F('offset') + written, updated_at=timezone.now())
+        if updated:
+            self.offset += written
+        return bool(updated)
+
+    def get_image_format(self):
+        """
+        Get the format of the assembled image, or None if invalid.
+        """
+        try:
+            with Image.open(self.path) as image:
+                image.verify()
+                return image.format
+        except (
+            OSError, UnidentifiedImageError, SyntaxError,
+            Image.DecompressionBombError
+        ):
+            return None
+
+    def remove_file(self):
+        """
+        Remove the temporary file, if any.
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,222 @@
+# Standard libraries
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
+# Third-party suppliers
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Local imports
+from offer_app.models import Offer
+from upload_app.models import Upload, fcntl
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def get_image_bytes(size=(400, 300)):
+    """
+    Get the bytes of a PNG image.
+    """
+    buffer = BytesIO()
+    Image.new('RGB', size, 'teal').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT, IMAGE_VARIANT_WORKERS=0,
+    UPLOAD_TEMP_DIR=os.path.join(MEDIA_ROOT, 'tmp'), UPLOAD_BUFFER_SIZE=256
+)
+class UploadTests(APITestCase):
+    """
+    Tests for resumable chunked uploads.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Remove the temporary media files.
+        """
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        """
+        Set up a business user with an offer and an image to upload.
+        """
+        self.business = User.objects.create_user(
+            username='biz', password='pass', type='business'
+        )
+        self.offer = Offer.objects.create(
+            user=self.business, title='Logo Design', description='Desc'
+        )
+        self.content = get_image_bytes()
+        self.client.force_authenticate(self.business)
+
+    def start_upload(self, content=None):
+        """
+        Start an upload of the given content.
+        """
+        content = self.content if content is None else content
+        res = self.client.post('/api/uploads/', {
+            'filename': '../my photo.png', 'size': len(content)
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return res.data['id']
+
+    def put_chunk(self, upload_id, chunk, offset):
+        """
+        Append a chunk to an upload.
+        """
+        return self.client.put(
+            f'/api/uploads/{upload_id}/', chunk,
+            content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def complete(self, upload_id, **data):
+        """
+        Complete an upload.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                f'/api/uploads/{upload_id}/complete/', data, format='json')
+
+    def test_upload_in_chunks_to_offer(self):
+        """
+        Ensure chunks are appended and the image attached to the offer.
+        """
+        upload_id = self.start_upload()
+        middle = len(self.content) // 2
+        res = self.put_chunk(upload_id, self.content[:middle], 0)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Upload-Offset'], str(middle))
+
+        res = self.client.get(f'/api/uploads/{upload_id}/')
+        self.assertEqual(res.data['offset'], middle)
+        res = self.put_chunk(upload_id, self.content[middle:], middle)
+        self.assertEqual(res.data['offset'], len(self.content))
+
+        res = self.complete(upload_id, target='offer', offer=self.offer.id)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['status'], 'completed')
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.image.name, 'offers/my_photo.png')
+        with self.offer.image.open('rb') as file:
+            self.assertEqual(file.read(), self.content)
+        self.assertFalse(os.path.exists(Upload.objects.get().path))
+
+    def test_upload_to_profile(self):
+        """
+        Ensure a completed upload is attached as profile picture.
+        """
+        upload_id = self.start_upload()
+        self.put_chunk(upload_id, self.content, 0)
+        res = self.complete(upload_id, target='profile')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.business.refresh_from_db()
+        self.assertTrue(self.business.file.name.startswith('profiles/'))
+
+    def test_put_chunk_offset_mismatch(self):
+        """
+        Ensure a chunk at the wrong offset gets HTTP 409.
+        """
+        upload_id = self.start_upload()
+        self.put_chunk(upload_id, self.content[:100], 0)
+        res = self.put_chunk(upload_id, self.content[200:300], 200)
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data['offset'], 100)
+
+    @unittest.skipIf(fcntl is None, 'File locks need fcntl.')
+    def test_put_chunk_while_other_chunk_is_written(self):
+        """
+        Ensure a chunk gets HTTP 409 while another one is written.
+        """
+        upload_id = self.start_upload()
+        upload = Upload.objects.get(pk=upload_id)
+        with upload.open_locked():
+            res = self.put_chunk(upload_id, self.content[:100], 0)
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data['offset'], 0)
+
+    def test_put_chunk_counted_meanwhile(self):
+        """
+        Ensure a chunk is not counted if the offset moved meanwhile.
+        """
+        upload_id = self.start_upload()
+        upload = Upload.objects.get(pk=upload_id)
+        Upload.objects.filter(pk=upload_id).update(offset=100)
+        self.assertFalse(upload.advance(50))
+        self.assertEqual(Upload.objects.get(pk=upload_id).offset, 100)
+
+    def test_put_chunk_exceeding_size(self):
+        """
+        Ensure a chunk beyond the declared size gets HTTP 413.
+        """
+        upload_id = self.start_upload(b'x' * 10)
+        res = self.put_chunk(upload_id, b'x' * 11, 0)
+        self.assertEqual(
+            res.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_complete_incomplete_or_invalid_upload(self):
+        """
+        Ensure incomplete uploads and non-images are not attached.
+        """
+        upload_id = self.start_upload()
+        self.put_chunk(upload_id, self.content[:100], 0)
+        res = self.complete(upload_id, target='offer', offer=self.offer.id)
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+        upload_id = self.start_upload()
+        self.put_chunk(upload_id, self.content, 0)
+        with mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 1000):
+            res = self.complete(upload_id, target='offer', offer=self.offer.id)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        upload_id = self.start_upload(b'no image')
+        self.put_chunk(upload_id, b'no image', 0)
+        res = self.complete(upload_id, target='offer', offer=self.offer.id)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.offer.refresh_from_db()
+        self.assertFalse(self.offer.image)
+
+    def test_upload_of_other_user(self):
+        """
+        Ensure uploads and offers of other users are not accessible.
+        """
+        upload_id = self.start_upload()
+        self.put_chunk(upload_id, self.content, 0)
+        other = User.objects.create_user(
+            username='other', password='pass', type='business'
+        )
+        other_offer = Offer.objects.create(user=other, title='Other')
+        res = self.complete(upload_id, target='offer', offer=other_offer.id)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(other)
+        res = self.client.get(f'/api/uploads/{upload_id}/')
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_purge_expired_uploads(self):
+        """
+        Ensure expired uploads and their files are removed.
+        """
+        upload_id = self.start_upload()
+        self.put_chunk(upload_id, self.content[:100], 0)
+        upload = Upload.objects.get(pk=upload_id)
+        Upload.objects.filter(pk=upload_id).update(
+            updated_at=timezone.now() - timedelta(days=2))
+        call_command('purge_uploads', stdout=StringIO())
+        self.assertFalse(Upload.objects.exists())
+        self.assertFalse(os.path.exists(upload.path))